@@ -3,22 +3,197 @@ AI Client for analyzing update conflicts
 Supports OpenAI-compatible endpoints (OpenAI, LMStudio, OpenWebUI, Ollama)
 """
 import asyncio
+import copy
+import hashlib
 import logging
 import json
-from typing import Dict, List, Optional
-from dependency_analyzer import DependencyAnalyzer
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+from issue_severity import count_severities
 
 logger = logging.getLogger(__name__)
 
+_get_integration = itemgetter('integration')
+
+# System prompt for update analysis. Kept as a single constant so every request sends a
+# byte-identical system message, letting providers with prompt/prefix caching reuse it.
+_SYSTEM_PROMPT = """You are an expert Home Assistant system administrator specializing in add-on and integration compatibility analysis.
+
+Your task is to analyze updates for Home Assistant add-ons and HACS integrations to identify:
+1. Potential dependency conflicts between updates
+2. Breaking changes that could affect system stability
+3. Integration compatibility issues
+4. Security concerns
+5. Installation order recommendations
+
+Provide your analysis in the following JSON format:
+{
+  "safe": true/false,
+  "confidence": 0.0-1.0,
+  "issues": [
+    {
+      "severity": "critical/high/medium/low",
+      "component": "component name",
+      "description": "detailed description",
+      "impact": "potential impact"
+    }
+  ],
+  "recommendations": [
+    "recommendation 1",
+    "recommendation 2"
+  ],
+  "summary": "Overall summary of the analysis"
+}
+
+Be thorough but concise. Focus on actionable insights."""
+
+# Closing instructions for per-component analysis, sent after one user message per update
+_COMPONENT_INSTRUCTIONS = """Analyze each update described above separately, while still taking conflicts with the other updates into account.
+
+Respond with a single JSON object of the form {"components": [...]} containing one entry per update, in the order given. Each entry uses the analysis format from the system prompt plus a "component" field with the update name."""
+
+# Update fields rendered into a context block; a block is rebuilt only when one changes
+_BLOCK_FIELDS = (
+    'name', 'slug', 'entity_id', 'type', 'current_version', 'latest_version',
+    'repository', 'release_url', 'release_summary', 'description'
+)
+
+
+@lru_cache(maxsize=1)
+def _openai_module():
+    """Import the openai SDK on first use; it pulls in httpx, pydantic and anyio"""
+    import openai
+    return openai
+
+
+def _update_sort_key(update: Dict) -> str:
+    """Stable ordering key for an update: its slug if present, else its name"""
+    return (update.get('slug') or update.get('name', '')).lower()
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+class _JsonObjectScanner:
+    """
+    Incrementally detects the end of the first JSON object in streamed text
+    
+    Brace depth is tracked from each candidate '{' to find where it closes; the
+    candidate only counts once it decodes as a JSON object. Braces in prose
+    before the JSON (e.g. "the {addon} updates") are therefore skipped and
+    scanning resumes at the next '{'.
+    """
+    
+    def __init__(self):
+        self.text = ''
+        self.pos = 0
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume more text; return True once the first JSON object is complete"""
+        self.text += text
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            self.pos += 1
+            if self.start < 0:
+                if char == '{':
+                    self.start = self.pos - 1
+                    self.depth = 1
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    if self._candidate_is_object():
+                        return True
+                    # Not JSON; look for the next candidate after this '{'
+                    self.pos = self.start + 1
+                    self.start = -1
+                    self.in_string = False
+                    self.escape = False
+        return False
+    
+    def _candidate_is_object(self) -> bool:
+        """Check whether the text from the current candidate '{' decodes as an object"""
+        try:
+            result, _end = _JSON_DECODER.raw_decode(self.text, self.start)
+        except ValueError:
+            return False
+        return isinstance(result, dict)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _decode_first_json_object(text: str) -> Optional[Dict]:
+    """
+    Return the first JSON object embedded in text, or None
+    
+    Responses in JSON mode are exactly one object and are parsed directly.
+    Otherwise raw_decode is tried at each '{' so prose or code fences around
+    the object (including stray braces before or after it) are skipped.
+    """
+    stripped = text.strip()
+    if stripped.startswith('{') and stripped.endswith('}'):
+        try:
+            return _json_loads(stripped)
+        except ValueError:
+            pass
+    
+    start = text.find('{')
+    while start >= 0:
+        try:
+            result, _end = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(result, dict):
+                return result
+        except ValueError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
 
 class AIClient:
     """Client for AI-powered conflict analysis"""
     
     # High-risk libraries that require special attention in updates
-    HIGH_RISK_LIBRARIES = {
+    HIGH_RISK_LIBRARIES = frozenset({
         'aiohttp', 'cryptography', 'numpy', 'pyjwt', 
         'sqlalchemy', 'protobuf', 'requests', 'urllib3'
-    }
+    })
     
     # Context formatting constants
     MAX_RELEASE_SUMMARY_LENGTH = 200  # Maximum characters for release summary
@@ -27,6 +202,42 @@ class AIClient:
     MAX_KEY_DEPS_SHOWN = 5  # Maximum key dependencies to show in context
     MAX_CRITICAL_DEPS_PREVIEW = 3  # Maximum critical dependencies to preview in system updates
     
+    # Request concurrency
+    MAX_CONCURRENT_REQUESTS = 4  # Maximum in-flight requests to the AI provider
+    MAX_UPDATES_PER_REQUEST = 10  # Larger update sets are split into concurrent batches
+    # Retries for 429s, 5xx, connection errors and timeouts. The openai SDK backs off
+    # exponentially with jitter and honours Retry-After; retries happen while the
+    # request semaphore is held, so a rate-limited provider throttles other batches.
+    AI_MAX_RETRIES = 3
+    
+    # OpenAI-compatible providers: (display name, required base URL suffix, placeholder API key).
+    # Ollama and LMStudio serve /v1 (typically on localhost:11434 and :1234); OpenWebUI
+    # serves /api/chat/completions. Any other provider uses the standard OpenAI client.
+    PROVIDER_SETTINGS = {
+        'ollama': ('Ollama', '/v1', 'ollama'),
+        'lmstudio': ('LMStudio', '/v1', 'lm-studio'),
+        'openwebui': ('OpenWebUI', '/api', 'not-needed'),
+    }
+    
+    # Providers that normally run on the local network
+    LOCAL_PROVIDERS = frozenset({'ollama', 'lmstudio'})
+    
+    # Providers known to reject response_format={"type": "json_object"}. JSON mode is
+    # tried for every other provider and disabled for the session if it is rejected.
+    JSON_MODE_UNSUPPORTED_PROVIDERS = frozenset({'lmstudio'})
+    
+    # Completion length for update analysis: a base allowance plus room per update
+    MAX_RESPONSE_TOKENS = 2000
+    RESPONSE_TOKENS_BASE = 200
+    RESPONSE_TOKENS_PER_UPDATE = 120
+    
+    # Response cache (persisted across restarts)
+    AI_CACHE_FILE = '/data/ai_cache.json'
+    AI_CACHE_TTL_SECONDS = 48 * 3600  # Long enough to cover the next daily check
+    AI_CACHE_MAX_ENTRIES = 64
+    RESULT_CACHE_MAX_ENTRIES = 128  # In-memory parsed results keyed by update set
+    CONTEXT_CACHE_MAX_ENTRIES = 4  # Recently built prompts, reused when a scan is retried
+    
     def __init__(self, config, dependency_graph=None):
         """Initialize the AI client
         
@@ -36,17 +247,73 @@ class AIClient:
         """
         self.config = config
         self.client = None
+        self._http_client = None  # Shared httpx.AsyncClient, closed by close()
         self.dependency_graph = dependency_graph
-        self.dependency_analyzer = DependencyAnalyzer(dependency_graph=dependency_graph)
+        # Bounds concurrent provider calls (update analysis, log analysis, installation review)
+        self.request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._response_cache = None  # Loaded lazily from AI_CACHE_FILE on first use
+        self._cache_write_lock = threading.Lock()  # Serializes writer threads
+        self._json_mode_rejected = set(self.JSON_MODE_UNSUPPORTED_PROVIDERS)
         
         if config.ai_enabled:
             self._initialize_client()
     
+    @cached_property
+    def dependency_analyzer(self):
+        """Non-AI analyzer, created (and imported) on first use by the fallback path"""
+        from dependency_analyzer import DependencyAnalyzer
+        return DependencyAnalyzer(dependency_graph=self._dependency_graph)
+    
+    @property
+    def dependency_graph(self):
+        """Dependency graph data from DependencyGraphBuilder"""
+        return self._dependency_graph
+    
+    @dependency_graph.setter
+    def dependency_graph(self, graph):
+        """Set the dependency graph and rebuild the lookup structures derived from it"""
+        self._dependency_graph = graph
+        if 'dependency_analyzer' in self.__dict__:
+            self.dependency_analyzer.dependency_graph = graph
+        self._dependency_info_cache = {}
+        self._context_cache = OrderedDict()
+        # Formatted per-update context blocks: (kind, slug or name) -> (field values, text)
+        self._block_cache = {}
+        # Results depend on the graph (dependency info is part of the prompt)
+        self._result_cache = OrderedDict()
+        
+        # Map lowercased domains and integration names to (position, integration data)
+        # so update matching is a dict lookup instead of a scan over all integrations.
+        # The position preserves the original "first integration wins" ordering.
+        self._integration_index_by_domain = {}
+        self._integration_index_by_name = {}
+        self._system_dependency_info = {}
+        if graph:
+            integrations = graph.get('integrations', {})
+            for position, (domain, integration_data) in enumerate(integrations.items()):
+                entry = (position, integration_data)
+                self._integration_index_by_domain.setdefault(domain.lower(), entry)
+                self._integration_index_by_name.setdefault(integration_data.get('name', '').lower(), entry)
+            
+            # System updates (core, supervisor, os) all share the same high-risk view.
+            # Intersect the small high-risk set with the map keys rather than scanning
+            # every package; sort for a stable order in the prompt.
+            dependency_map = graph.get('dependency_map', {})
+            high_risk_deps = [
+                {'package': pkg, 'user_count': len(dependency_map[pkg]), 'high_risk': True}
+                for pkg in sorted(self.HIGH_RISK_LIBRARIES & dependency_map.keys())
+            ]
+            self._system_dependency_info = {
+                'type': 'system',
+                'high_risk_dependencies': high_risk_deps[:self.MAX_HIGH_RISK_DEPS_SHOWN],
+                'impact_radius': len(integrations)
+            }
+    
     def _initialize_client(self):
-        """Initialize OpenAI-compatible client"""
+        """Initialize OpenAI-compatible async client"""
         try:
             logger.debug(f"Initializing AI client for provider: {self.config.ai_provider}")
-            from openai import OpenAI
+            AsyncOpenAI = _openai_module().AsyncOpenAI
             import httpx
             
             # Configure timeout to prevent hanging on network issues
@@ -60,48 +327,48 @@ class AIClient:
                 pool=30.0      # Acquiring connection from pool (increased from 10s)
             )
             
+            # One pooled HTTP client for the add-on lifetime so concurrent requests
+            # reuse warm connections. HTTP/2 multiplexing is used for remote providers
+            # when h2 is installed; local Ollama/LMStudio servers stay on HTTP/1.1
+            http2 = False
+            if self.config.ai_provider not in self.LOCAL_PROVIDERS:
+                try:
+                    import h2  # noqa: F401
+                    http2 = True
+                except ImportError:
+                    pass
+            self._http_client = httpx.AsyncClient(
+                http2=http2,
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=120.0)
+            )
+            
             # Configure based on provider
-            if self.config.ai_provider == 'ollama':
-                # Ollama typically runs on localhost:11434
-                base_url = self.config.ai_endpoint
-                if not base_url.endswith('/v1'):
-                    base_url = f"{base_url}/v1"
-                logger.debug(f"Configuring Ollama client with base_url: {base_url}")
-                self.client = OpenAI(
-                    base_url=base_url,
-                    api_key="ollama",  # Ollama doesn't require a real key
-                    timeout=timeout
-                )
-            elif self.config.ai_provider == 'lmstudio':
-                # LMStudio typically runs on localhost:1234
-                base_url = self.config.ai_endpoint
-                if not base_url.endswith('/v1'):
-                    base_url = f"{base_url}/v1"
-                logger.debug(f"Configuring LMStudio client with base_url: {base_url}")
-                self.client = OpenAI(
-                    base_url=base_url,
-                    api_key="lm-studio",  # LMStudio doesn't require a real key
-                    timeout=timeout
-                )
-            elif self.config.ai_provider == 'openwebui':
-                # OpenWebUI uses /api/chat/completions endpoint
+            settings = self.PROVIDER_SETTINGS.get(self.config.ai_provider)
+            if settings:
+                name, suffix, placeholder_key = settings
                 base_url = self.config.ai_endpoint
-                if not base_url.endswith('/api'):
-                    base_url = f"{base_url}/api"
-                logger.debug(f"Configuring OpenWebUI client with base_url: {base_url}")
-                self.client = OpenAI(
-                    base_url=base_url,
-                    api_key=self.config.api_key or "not-needed",
-                    timeout=timeout
-                )
+                if not base_url.endswith(suffix):
+                    base_url = f"{base_url}{suffix}"
+                # Local servers don't check keys; others may be behind authentication
+                if self.config.ai_provider in self.LOCAL_PROVIDERS:
+                    api_key = placeholder_key
+                else:
+                    api_key = self.config.api_key or placeholder_key
+                logger.debug(f"Configuring {name} client with base_url: {base_url}")
             else:  # openai or default
                 # Standard OpenAI API
+                base_url = self.config.ai_endpoint if self.config.ai_endpoint != 'http://localhost:11434' else None
+                api_key = self.config.api_key
                 logger.debug(f"Configuring OpenAI client with endpoint: {self.config.ai_endpoint}")
-                self.client = OpenAI(
-                    api_key=self.config.api_key,
-                    base_url=self.config.ai_endpoint if self.config.ai_endpoint != 'http://localhost:11434' else None,
-                    timeout=timeout
-                )
+            
+            self.client = AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=self.AI_MAX_RETRIES,
+                http_client=self._http_client
+            )
             
             logger.info(f"AI client initialized: {self.config.ai_provider}")
         except Exception as e:
@@ -117,10 +384,24 @@ class AIClient:
             logger.debug("Full error details:", exc_info=True)
             self.client = None
     
-    async def analyze_updates(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
+    async def analyze_updates(self, addon_updates: List[Dict], hacs_updates: List[Dict],
+                              per_component: bool = False) -> Dict:
         """
         Analyze updates for potential conflicts and issues
         
+        Args:
+            addon_updates: Add-on and system updates
+            hacs_updates: HACS/integration updates
+            per_component: Describe each update in its own message and ask for one
+                analysis per update (returned merged), instead of a single overall
+                analysis. Still one request per batch.
+        
         Returns:
             Dict with keys:
                 - safe: bool - Whether updates are safe to install
@@ -128,101 +409,198 @@ class AIClient:
                 - issues: List[Dict] - List of identified issues
                 - recommendations: List[str] - List of recommendations
                 - summary: str - Overall summary
+                - severity_counts: Dict[str, int] - Number of issues per severity
+                - cached: bool - Present (True) when a previous result was reused
         """
         if not self.config.ai_enabled or not self.client:
             logger.debug("AI not enabled or client not available, using fallback analysis")
-            return self._fallback_analysis(addon_updates, hacs_updates)
+            # Run the CPU-bound analysis off the event loop so the web server and
+            # other tasks stay responsive
+            return await asyncio.to_thread(self._fallback_analysis, addon_updates, hacs_updates)
+        
+        # Order updates deterministically so the same pending set always yields
+        # byte-identical prompts, keeping batches, the response cache and any
+        # provider-side prefix cache stable across scans
+        addon_updates = sorted(addon_updates, key=_update_sort_key)
+        hacs_updates = sorted(hacs_updates, key=_update_sort_key)
+        
+        # Most scheduled scans see the same pending update set as the previous one;
+        # reuse the earlier result instead of rebuilding and re-sending the prompt
+        result_key = (self._result_cache_key(addon_updates, hacs_updates), per_component)
+        cached = self._result_cache.get(result_key)
+        if cached is not None:
+            self._result_cache.move_to_end(result_key)
+            logger.info("Update set unchanged since last analysis, reusing previous AI result")
+            return {**copy.deepcopy(cached), 'cached': True}
         
         try:
-            # Prepare the context for AI analysis
-            logger.debug("Preparing context for AI analysis")
-            context = self._prepare_analysis_context(addon_updates, hacs_updates)
-            logger.debug(f"Context prepared, size: {len(context)} characters")
-            
-            # Call AI for analysis with timeout protection
-            # The OpenAI client's .create() call is synchronous and can block the event loop
-            # We run it in a thread pool and add an async timeout wrapper for robustness
-            logger.info(f"Sending analysis request to AI ({self.config.ai_provider} - {self.config.ai_model})")
-            logger.debug(f"AI endpoint: {self.config.ai_endpoint}")
-            logger.debug("Using async timeout wrapper to prevent blocking (180s total timeout)")
-            
-            # Define the synchronous AI call function
-            def _sync_ai_call():
-                logger.debug("Starting synchronous AI API call in thread pool")
-                try:
-                    result = self.client.chat.completions.create(
-                        model=self.config.ai_model,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": self._get_system_prompt()
-                            },
-                            {
-                                "role": "user",
-                                "content": context
-                            }
-                        ],
-                        temperature=0.3,
-                        max_tokens=2000
-                    )
-                    logger.debug("Synchronous AI API call completed successfully")
-                    return result
-                except Exception as e:
-                    logger.error(f"Synchronous AI API call failed: {e}")
-                    raise
-            
-            # Run in thread pool with async timeout
-            # Total timeout: 160s (~2.5 minutes), composed of:
-            # - 30s connection timeout
-            # - 120s read timeout
-            # - 10s additional buffer for retries, thread scheduling, and other overhead
-            try:
-                logger.debug("Executing AI call with asyncio.to_thread and 160s timeout")
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(_sync_ai_call),
-                    timeout=160.0
-                )
-                logger.debug("AI call completed within timeout")
-            except asyncio.TimeoutError:
-                logger.error("AI analysis timed out after 160 seconds")
-                logger.error(f"AI Provider: {self.config.ai_provider}")
-                logger.error(f"AI Endpoint: {self.config.ai_endpoint}")
-                logger.error(f"AI Model: {self.config.ai_model}")
-                logger.info(
-                    "AI analysis timeout details:\n"
-                    "  1. The AI provider may not be responding or could be overloaded\n"
-                    "  2. The network connection may be slow or unstable\n"
-                    "  3. The AI model might be taking too long to generate a response\n"
-                    "  4. Check if the AI endpoint is accessible: " + self.config.ai_endpoint + "\n"
-                    "  5. Try increasing timeout or disabling AI: Set 'ai_enabled: false' in configuration\n"
-                    "Falling back to dependency analysis"
+            batches = self._batch_updates(addon_updates, hacs_updates)
+            if len(batches) == 1:
+                result = await self._analyze_batch(addon_updates, hacs_updates, per_component)
+            else:
+                # Large update sets are split into smaller batches that are analyzed
+                # concurrently (bounded by request_semaphore) and merged afterwards
+                logger.info(f"Splitting {len(addon_updates) + len(hacs_updates)} updates into {len(batches)} concurrent AI requests")
+                results = await asyncio.gather(
+                    *(self._analyze_batch(batch_addons, batch_hacs, per_component) for batch_addons, batch_hacs in batches),
+                    return_exceptions=True
                 )
-                raise  # Re-raise to trigger fallback
-            except Exception as e:
-                logger.error(f"AI call failed with exception: {e}")
-                raise
+                for batch_result in results:
+                    if isinstance(batch_result, BaseException):
+                        raise batch_result
+                result = self._merge_results(results)
             
-            # Parse AI response
-            ai_response = response.choices[0].message.content
-            logger.info(f"AI analysis completed: {len(ai_response)} chars")
-            logger.debug(f"AI response: {ai_response[:200]}...")
+            # Consumers such as the dashboard read the counts instead of rescanning issues
+            if 'severity_counts' not in result:
+                result['severity_counts'] = count_severities(result['issues'])
             
-            # Parse the structured response
-            return self._parse_ai_response(ai_response, addon_updates, hacs_updates)
+            # Only safe AI verdicts are reused; flagged issues are re-examined every scan
+            if result.get('ai_analysis') and result.get('safe'):
+                self._result_cache[result_key] = copy.deepcopy(result)
+                while len(self._result_cache) > self.RESULT_CACHE_MAX_ENTRIES:
+                    self._result_cache.popitem(last=False)
+            return result
             
         except Exception as e:
             # Catch all exceptions including timeouts, connection errors, etc.
             logger.error(f"AI analysis failed: {e}", exc_info=True)
             logger.info("Falling back to dependency analysis")
-            return self._fallback_analysis(addon_updates, hacs_updates)
+            return await asyncio.to_thread(self._fallback_analysis, addon_updates, hacs_updates)
+    
+    @staticmethod
+    def _result_cache_key(addon_updates: List[Dict], hacs_updates: List[Dict]) -> Tuple:
+        """Identify an update set by each update's name and version transition"""
+        return (
+            tuple((a.get('slug') or a.get('name'), a.get('current_version'), a.get('latest_version')) for a in addon_updates),
+            tuple((h.get('name'), h.get('current_version'), h.get('latest_version')) for h in hacs_updates)
+        )
+    
+    def _batch_updates(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> List[Tuple[List[Dict], List[Dict]]]:
+        """
+        Split updates into batches of at most MAX_UPDATES_PER_REQUEST entries
+        
+        Small update sets stay in a single batch so the AI can still reason about
+        conflicts between them.
+        """
+        tagged = [(update, False) for update in addon_updates] + [(update, True) for update in hacs_updates]
+        if len(tagged) <= self.MAX_UPDATES_PER_REQUEST:
+            return [(addon_updates, hacs_updates)]
+        
+        batches = []
+        for start in range(0, len(tagged), self.MAX_UPDATES_PER_REQUEST):
+            chunk = tagged[start:start + self.MAX_UPDATES_PER_REQUEST]
+            batches.append((
+                [update for update, is_hacs in chunk if not is_hacs],
+                [update for update, is_hacs in chunk if is_hacs]
+            ))
+        return batches
+    
+    async def _analyze_batch(self, addon_updates: List[Dict], hacs_updates: List[Dict],
+                             per_component: bool = False) -> Dict:
+        """Send a single analysis request for a batch of updates and parse the response"""
+        # Prepare the context for AI analysis
+        logger.debug("Preparing context for AI analysis")
+        context = self._get_context(addon_updates, hacs_updates, per_component)
+        if per_component:
+            logger.debug(f"Context prepared, {len(context)} messages, size: {sum(map(len, context))} characters")
+        else:
+            logger.debug(f"Context prepared, size: {len(context)} characters")
+        
+        # Call AI for analysis with timeout protection
+        # The AsyncOpenAI client does not block the event loop, so the web UI,
+        # log monitoring and other scheduled work keep running during inference
+        logger.info(f"Sending analysis request to AI ({self.config.ai_provider} - {self.config.ai_model})")
+        logger.debug(f"AI endpoint: {self.config.ai_endpoint}")
+        
+        # Total timeout: 160s (~2.5 minutes), composed of:
+        # - 30s connection timeout
+        # - 120s read timeout
+        # - 10s additional buffer for retries and other overhead
+        try:
+            logger.debug("Executing AI call with 160s timeout")
+            max_tokens = min(
+                self.MAX_RESPONSE_TOKENS,
+                self.RESPONSE_TOKENS_BASE + self.RESPONSE_TOKENS_PER_UPDATE * (len(addon_updates) + len(hacs_updates))
+            )
+            # Unsafe verdicts are never persisted, so flagged issues are re-examined next scan
+            ai_response = await self._call_ai(
+                context, timeout=160.0, stop_after_json=True, max_tokens=max_tokens,
+                cache=True, cache_if=self._is_safe_response
+            )
+            logger.debug("AI call completed within timeout")
+        except asyncio.TimeoutError:
+            logger.error("AI analysis timed out after 160 seconds")
+            logger.error(f"AI Provider: {self.config.ai_provider}")
+            logger.error(f"AI Endpoint: {self.config.ai_endpoint}")
+            logger.error(f"AI Model: {self.config.ai_model}")
+            logger.info(
+                "AI analysis timeout details:\n"
+                "  1. The AI provider may not be responding or could be overloaded\n"
+                "  2. The network connection may be slow or unstable\n"
+                "  3. The AI model might be taking too long to generate a response\n"
+                "  4. Check if the AI endpoint is accessible: " + self.config.ai_endpoint + "\n"
+                "  5. Try increasing timeout or disabling AI: Set 'ai_enabled: false' in configuration\n"
+                "Falling back to dependency analysis"
+            )
+            raise  # Re-raise to trigger fallback
+        except Exception as e:
+            logger.error(f"AI call failed with exception: {e}")
+            raise
+        
+        logger.info(f"AI analysis completed: {len(ai_response)} chars")
+        logger.debug(f"AI response: {ai_response[:200]}...")
+        
+        # Parse the structured response
+        if per_component:
+            result = self._parse_component_response(ai_response)
+        else:
+            result = self._parse_ai_response(ai_response)
+        if result is None:
+            # analyze_updates falls back to dependency analysis of the whole
+            # update set; a per-batch fallback would repeat the graph-wide checks
+            raise ValueError("AI response could not be parsed")
+        return result
+    
+    def _merge_results(self, results: List[Dict]) -> Dict:
+        """Merge per-batch analysis results into a single result"""
+        issues = []
+        recommendations = []
+        for result in results:
+            issues.extend(result.get('issues', []))
+            recommendations.extend(result.get('recommendations', []))
+        
+        return {
+            'safe': all(result.get('safe', True) for result in results),
+            'confidence': min(result.get('confidence', 0.7) for result in results),
+            'issues': issues,
+            'recommendations': list(dict.fromkeys(recommendations)),
+            'summary': ' '.join(result.get('summary', '') for result in results if result.get('summary')),
+            'ai_analysis': all(result.get('ai_analysis', False) for result in results)
+        }
     
-    async def _call_ai(self, prompt: str, system_prompt: str = None) -> str:
+    async def _call_ai(self, prompt: Union[str, List[str]], system_prompt: str = None,
+                       timeout: Optional[float] = None, stop_after_json: bool = False,
+                       max_tokens: int = 2000, cache: bool = False,
+                       cache_if: Optional[Callable[[str], bool]] = None) -> str:
         """
         Generic method to call AI with a prompt
         
+        With cache=True, responses are cached by a hash of the model, system prompt
+        and prompt, so repeated scheduled runs over an unchanged update set skip the
+        AI round-trip.
+        
         Args:
-            prompt: User prompt to send to AI
+            prompt: User prompt to send to AI, or a list of prompts sent as
+                consecutive user messages
             system_prompt: Optional system prompt (uses default if not provided)
+            timeout: Optional overall timeout in seconds for the request
+            stop_after_json: The response is expected to be a JSON object: request
+                JSON mode where the provider supports it and stop reading once a
+                complete object has been received
+            max_tokens: Upper bound on the number of generated tokens
+            cache: Serve and store the response through the persisted response cache
+            cache_if: Optional predicate; only responses for which it returns True
+                are stored in or served from the response cache
             
         Returns:
             AI response as string
@@ -231,57 +609,160 @@ class AIClient:
             raise Exception("AI client not initialized")
         
         if system_prompt is None:
-            system_prompt = self._get_system_prompt()
+            system_prompt = _SYSTEM_PROMPT
+        
+        if cache:
+            prompt_text = prompt if isinstance(prompt, str) else '\0'.join(prompt)
+            cache_key = hashlib.sha256(
+                f"{self.config.ai_model}\0{system_prompt}\0{prompt_text}".encode('utf-8')
+            ).hexdigest()
+            cached = await self._get_cached_response(cache_key)
+            if cached is not None and (cache_if is None or cache_if(cached)):
+                logger.info("Using cached AI response (update set unchanged since last analysis)")
+                return cached
+        
+        async with self.request_semaphore:
+            content = await asyncio.wait_for(
+                self._stream_completion(system_prompt, prompt, stop_after_json, max_tokens),
+                timeout=timeout
+            )
         
-        response = self.client.chat.completions.create(
+        if cache and (cache_if is None or cache_if(content)):
+            await self._store_cached_response(cache_key, content)
+        return content
+    
+    async def _stream_completion(self, system_prompt: str, prompt: Union[str, List[str]],
+                                 stop_after_json: bool, max_tokens: int = 2000) -> str:
+        """
+        Stream a chat completion and return the concatenated response text
+        
+        Streaming lets local providers (Ollama/LMStudio) return tokens as they are
+        generated. When stop_after_json is set, the stream is closed as soon as the
+        first top-level JSON object is complete, so any trailing prose the model
+        writes after it is never generated or downloaded.
+        """
+        prompts = [prompt] if isinstance(prompt, str) else prompt
+        request = dict(
             model=self.config.ai_model,
             messages=[
                 {
                     "role": "system",
                     "content": system_prompt
                 },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
+                *({"role": "user", "content": text} for text in prompts)
             ],
             temperature=0.3,
-            max_tokens=2000
+            max_tokens=max_tokens,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        json_mode = stop_after_json and self.config.ai_provider not in self._json_mode_rejected
+        if not json_mode:
+            stream = await self.client.chat.completions.create(**request)
+        else:
+            # Have the server constrain output to a single JSON object
+            try:
+                stream = await self.client.chat.completions.create(
+                    **request, response_format={"type": "json_object"}
+                )
+            except _openai_module().BadRequestError as e:
+                # Other bad requests (e.g. context length) would fail without JSON mode too
+                if not self._is_json_mode_rejection(e):
+                    raise
+                logger.warning(f"AI provider rejected JSON mode ({e}), retrying without response_format")
+                stream = await self.client.chat.completions.create(**request)
+                # Only remember the rejection once the plain request has succeeded
+                self._json_mode_rejected.add(self.config.ai_provider)
+        
+        chunks = []
+        scanner = _JsonObjectScanner() if stop_after_json else None
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
+                chunks.append(text)
+                if scanner and scanner.feed(text):
+                    logger.debug("Complete JSON object received, closing AI response stream early")
+                    break
+        
+        return ''.join(chunks)
+    
+    @staticmethod
+    def _is_json_mode_rejection(error: Exception) -> bool:
+        """Check whether a bad request error is about the response_format parameter"""
+        if getattr(error, 'param', None) == 'response_format':
+            return True
+        return 'response_format' in str(getattr(error, 'message', None) or error)
+    
+    def _read_response_cache(self) -> Dict[str, Tuple[float, str]]:
+        """Read the persisted AI response cache from disk (blocking)"""
+        try:
+            if os.path.exists(self.AI_CACHE_FILE):
+                with open(self.AI_CACHE_FILE, 'rb') as f:
+                    data = _json_loads(f.read())
+                cache = {
+                    key: (entry['timestamp'], entry['response'])
+                    for key, entry in data.items()
+                }
+                logger.debug(f"Loaded {len(cache)} cached AI responses from {self.AI_CACHE_FILE}")
+                return cache
+        except Exception as e:
+            logger.warning(f"Failed to load AI response cache: {e}")
+        return {}
+    
+    def _write_response_cache(self, entries: Dict[str, Tuple[float, str]]):
+        """Write a snapshot of the AI response cache to disk (blocking)"""
+        try:
+            os.makedirs(os.path.dirname(self.AI_CACHE_FILE), exist_ok=True)
+            tmp_file = f"{self.AI_CACHE_FILE}.tmp"
+            with self._cache_write_lock:
+                with open(tmp_file, 'wb') as f:
+                    f.write(_json_dumps({key: {'timestamp': ts, 'response': text} for key, (ts, text) in entries.items()}))
+                os.replace(tmp_file, self.AI_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Failed to save AI response cache: {e}")
+    
+    async def _load_response_cache(self) -> Dict[str, Tuple[float, str]]:
+        """Load the persisted AI response cache on first use, off the event loop"""
+        if self._response_cache is None:
+            cache = await asyncio.to_thread(self._read_response_cache)
+            # Another caller may have finished loading while this one waited
+            if self._response_cache is None:
+                self._response_cache = cache
+        return self._response_cache
+    
+    async def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Return a cached AI response if present and not expired"""
+        cache = await self._load_response_cache()
+        entry = cache.get(cache_key)
+        if entry is None:
+            return None
+        timestamp, response = entry
+        if time.time() - timestamp > self.AI_CACHE_TTL_SECONDS:
+            del cache[cache_key]
+            return None
+        return response
+    
+    async def _store_cached_response(self, cache_key: str, response: str):
+        """Store an AI response in the cache and persist it to disk"""
+        cache = await self._load_response_cache()
+        now = time.time()
+        cache[cache_key] = (now, response)
+        
+        # Drop expired entries, then the oldest ones beyond the size limit
+        for key in [k for k, (ts, _) in cache.items() if now - ts > self.AI_CACHE_TTL_SECONDS]:
+            del cache[key]
+        while len(cache) > self.AI_CACHE_MAX_ENTRIES:
+            del cache[min(cache, key=lambda k: cache[k][0])]
+        
+        await asyncio.to_thread(self._write_response_cache, dict(cache))
     
     def _get_system_prompt(self) -> str:
         """Get system prompt for AI analysis"""
-        return """You are an expert Home Assistant system administrator specializing in add-on and integration compatibility analysis.
-
-Your task is to analyze updates for Home Assistant add-ons and HACS integrations to identify:
-1. Potential dependency conflicts between updates
-2. Breaking changes that could affect system stability
-3. Integration compatibility issues
-4. Security concerns
-5. Installation order recommendations
-
-Provide your analysis in the following JSON format:
-{
-  "safe": true/false,
-  "confidence": 0.0-1.0,
-  "issues": [
-    {
-      "severity": "critical/high/medium/low",
-      "component": "component name",
-      "description": "detailed description",
-      "impact": "potential impact"
-    }
-  ],
-  "recommendations": [
-    "recommendation 1",
-    "recommendation 2"
-  ],
-  "summary": "Overall summary of the analysis"
-}
-
-Be thorough but concise. Focus on actionable insights."""
+        return _SYSTEM_PROMPT
     
     def _get_dependency_info_for_update(self, update: Dict) -> Dict:
         """
@@ -324,41 +805,36 @@ Be thorough but concise. Focus on actionable insights."""
         if not self.dependency_graph:
             return {}
         
-        # Try to match update to integration in dependency graph
-        # For core/supervisor/os updates, look for system-level dependencies
         update_type = update.get('type', 'addon')
-        integrations = self.dependency_graph.get('integrations', {})
-        dependency_map = self.dependency_graph.get('dependency_map', {})
+        update_name = update.get('name', '').lower()
+        slug = update.get('slug', '').lower()
         
-        # For system updates (core, supervisor, os), analyze high-risk shared dependencies
+        # Results only depend on these keys and the graph, so memoize them until
+        # the graph is replaced
+        cache_key = (update_type, update_name, slug)
+        if cache_key not in self._dependency_info_cache:
+            self._dependency_info_cache[cache_key] = self._compute_dependency_info(update_type, update_name, slug)
+        return self._dependency_info_cache[cache_key]
+    
+    def _compute_dependency_info(self, update_type: str, update_name: str, slug: str) -> Dict:
+        """Compute dependency information for _get_dependency_info_for_update"""
+        # For system updates (core, supervisor, os), report high-risk shared dependencies
+        # (precomputed once per graph)
         if update_type in ['core', 'supervisor', 'os']:
-            high_risk_deps = []
-            for pkg, users in dependency_map.items():
-                if pkg in self.HIGH_RISK_LIBRARIES:
-                    high_risk_deps.append({
-                        'package': pkg,
-                        'user_count': len(users),
-                        'high_risk': True
-                    })
-            return {
-                'type': 'system',
-                'high_risk_dependencies': high_risk_deps[:self.MAX_HIGH_RISK_DEPS_SHOWN],
-                'impact_radius': len(integrations)
-            }
+            return self._system_dependency_info
         
-        # For add-ons and integrations, try to find matching integration
-        update_name = update.get('name', '').lower()
-        slug = update.get('slug', '').lower()
+        dependency_map = self.dependency_graph.get('dependency_map', {})
         
-        # Try to find matching integration by domain/name
-        matching_integration = None
-        for domain, integration_data in integrations.items():
-            # Use exact matching to avoid false positives
-            if (domain.lower() == slug or 
-                domain.lower() == update_name or
-                integration_data.get('name', '').lower() == update_name):
-                matching_integration = integration_data
-                break
+        # For add-ons and integrations, try to find matching integration by domain/name
+        # Use exact matching to avoid false positives
+        candidates = [
+            entry for entry in (
+                self._integration_index_by_domain.get(slug),
+                self._integration_index_by_domain.get(update_name),
+                self._integration_index_by_name.get(update_name)
+            ) if entry is not None
+        ]
+        matching_integration = min(candidates, key=lambda entry: entry[0])[1] if candidates else None
         
         if matching_integration:
             requirements = matching_integration.get('requirements', [])
@@ -368,9 +844,9 @@ Be thorough but concise. Focus on actionable insights."""
             # Calculate impact: how many other integrations use this integration's dependencies
             impacted = set()
             for req in requirements:
-                pkg = req.get('package')
-                if pkg and pkg in dependency_map:
-                    impacted.update(u['integration'] for u in dependency_map[pkg])
+                users = dependency_map.get(req.get('package'))
+                if users:
+                    impacted.update(map(_get_integration, users))
             
             return {
                 'type': 'integration',
@@ -381,147 +857,269 @@ Be thorough but concise. Focus on actionable insights."""
         
         return {}
     
-    def _prepare_analysis_context(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> str:
-        """Prepare context for AI analysis with dependency information"""
-        context = "# Update Analysis Request\n\n"
-        
-        # Add dependency graph summary if available
+    @staticmethod
+    def _truncate(text: str, max_length: int) -> str:
+        """Truncate text to max_length characters, adding an ellipsis if shortened"""
+        return text if len(text) <= max_length else f"{text[:max_length]}..."
+    
+    def _append_requirements(self, parts: List[str], heading: str, requirements: List[Dict]):
+        """Append a bulleted list of an integration's key requirements to parts"""
+        if not requirements:
+            return
+        parts.append(f"  - {heading}:\n")
+        parts.extend(
+            f"    • {req['package']} {req['specifier']}{' ⚠️' if req.get('high_risk') else ''}\n"
+            for req in requirements[:self.MAX_KEY_DEPS_SHOWN]
+        )
+    
+    def _format_system_context(self) -> str:
+        """Format the dependency graph summary section (empty without a graph)"""
         if self.dependency_graph:
             stats = self.dependency_graph.get('machine_readable', {}).get('statistics', {})
             if stats:
-                context += "## System Context:\n"
-                context += f"- Total Integrations: {stats.get('total_integrations', 0)}\n"
-                context += f"- Unique Dependencies: {stats.get('total_dependencies', 0)}\n"
-                context += f"- High-Risk Dependencies: {stats.get('high_risk_dependencies', 0)}\n"
-                context += "\n"
+                return (
+                    "## System Context:\n"
+                    f"- Total Integrations: {stats.get('total_integrations', 0)}\n"
+                    f"- Unique Dependencies: {stats.get('total_dependencies', 0)}\n"
+                    f"- High-Risk Dependencies: {stats.get('high_risk_dependencies', 0)}\n"
+                    "\n"
+                )
+        return ""
+    
+    def _get_context(self, addon_updates: List[Dict], hacs_updates: List[Dict],
+                     per_component: bool) -> Union[str, List[str]]:
+        """
+        Return the analysis context for a batch, reusing a recently built one
+        
+        A failed or timed-out analysis is retried on the next scan with the same
+        update set, so the last few contexts are kept to skip rebuilding them.
+        """
+        key = (
+            per_component,
+            tuple(tuple(update.get(field) for field in _BLOCK_FIELDS) for update in addon_updates),
+            tuple(tuple(update.get(field) for field in _BLOCK_FIELDS) for update in hacs_updates)
+        )
+        context = self._context_cache.get(key)
+        if context is not None:
+            self._context_cache.move_to_end(key)
+            return context
+        
+        if per_component:
+            context = self._prepare_component_messages(addon_updates, hacs_updates)
+        else:
+            context = self._prepare_analysis_context(addon_updates, hacs_updates)
+        self._context_cache[key] = context
+        while len(self._context_cache) > self.CONTEXT_CACHE_MAX_ENTRIES:
+            self._context_cache.popitem(last=False)
+        return context
+    
+    def _cached_block(self, kind: str, update: Dict, formatter) -> str:
+        """
+        Return the formatted context block for an update, reusing the previous text
+        
+        Most pending updates are unchanged between scans, so their blocks are only
+        re-rendered when one of the rendered fields changes (or the graph is replaced).
+        """
+        fields = tuple(update.get(field) for field in _BLOCK_FIELDS)
+        key = (kind, update.get('slug') or update.get('name'))
+        entry = self._block_cache.get(key)
+        if entry is not None and entry[0] == fields:
+            return entry[1]
+        text = formatter(update)
+        self._block_cache[key] = (fields, text)
+        return text
+    
+    def _format_addon_block(self, addon: Dict) -> str:
+        """Format one add-on/system update entry with its dependency information"""
+        # Handle both formats: with slug (from get_addon_updates) and without slug (from get_all_updates)
+        addon_identifier = ""
+        if addon.get('slug'):
+            addon_identifier = f" ({addon['slug']})"
+        elif addon.get('entity_id'):
+            addon_identifier = f" ({addon['entity_id']})"
+        
+        # Determine update criticality
+        update_type = addon.get('type', 'addon')
+        criticality = ""
+        if update_type in ['core', 'supervisor', 'os']:
+            criticality = " [CRITICAL SYSTEM UPDATE]"
+        
+        parts = [
+            f"- **{addon['name']}**{addon_identifier}{criticality}\n"
+            f"  - Current: {addon['current_version']} → Latest: {addon['latest_version']}\n"
+            f"  - Type: {update_type}\n"
+        ]
+        
+        # Add repository and release info
+        if addon.get('repository'):
+            parts.append(f"  - Repository: {addon['repository']}\n")
+        if addon.get('release_url'):
+            parts.append(f"  - Release Notes: {addon['release_url']}\n")
+        if addon.get('release_summary'):
+            summary = self._truncate(addon['release_summary'], self.MAX_RELEASE_SUMMARY_LENGTH)
+            parts.append(f"  - Summary: {summary}\n")
+        if addon.get('description'):
+            parts.append(f"  - Description: {addon['description']}\n")
+        
+        # Add dependency information if available
+        dep_info = self._get_dependency_info_for_update(addon)
+        if dep_info:
+            if dep_info.get('type') == 'system':
+                high_risk = dep_info.get('high_risk_dependencies', [])
+                if high_risk:
+                    parts.append(
+                        f"  - Impact: System-wide ({dep_info.get('impact_radius', 0)} integrations)\n"
+                        "  - Critical Dependencies:\n"
+                    )
+                    for dep in high_risk[:self.MAX_CRITICAL_DEPS_PREVIEW]:
+                        parts.append(f"    • {dep['package']} (used by {dep['user_count']} integrations) ⚠️\n")
+            elif dep_info.get('type') == 'integration':
+                if dep_info.get('high_risk_count', 0) > 0:
+                    parts.append(f"  - High-Risk Dependencies: {dep_info['high_risk_count']}\n")
+                if dep_info.get('shared_dependency_impact', 0) > 0:
+                    parts.append(f"  - Shared Dependency Impact: {dep_info['shared_dependency_impact']} integrations\n")
+                self._append_requirements(parts, "Key Dependencies", dep_info.get('requirements', []))
+        
+        parts.append("\n")
+        return ''.join(parts)
+    
+    def _format_hacs_block(self, hacs: Dict) -> str:
+        """Format one HACS/integration update entry with its dependency information"""
+        parts = [
+            f"- **{hacs['name']}**\n"
+            f"  - Current: {hacs['current_version']} → Latest: {hacs['latest_version']}\n"
+        ]
+        
+        if hacs.get('repository'):
+            parts.append(f"  - Repository: {hacs['repository']}\n")
+        if hacs.get('release_url'):
+            parts.append(f"  - Release Notes: {hacs['release_url']}\n")
+        if hacs.get('release_summary'):
+            summary = self._truncate(hacs['release_summary'], self.MAX_RELEASE_SUMMARY_LENGTH)
+            parts.append(f"  - Summary: {summary}\n")
+        
+        # Add dependency information
+        dep_info = self._get_dependency_info_for_update(hacs)
+        if dep_info and dep_info.get('type') == 'integration':
+            if dep_info.get('high_risk_count', 0) > 0:
+                parts.append(f"  - High-Risk Dependencies: {dep_info['high_risk_count']}\n")
+            self._append_requirements(parts, "Dependencies", dep_info.get('requirements', []))
+        
+        parts.append("\n")
+        return ''.join(parts)
+    
+    def _prepare_analysis_context(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> str:
+        """Prepare context for AI analysis with dependency information"""
+        parts = ["# Update Analysis Request\n\n", self._format_system_context()]
         
         if addon_updates:
-            context += "## Add-on/System Updates Available:\n"
-            for addon in addon_updates:
-                # Handle both formats: with slug (from get_addon_updates) and without slug (from get_all_updates)
-                addon_identifier = ""
-                if addon.get('slug'):
-                    addon_identifier = f" ({addon['slug']})"
-                elif addon.get('entity_id'):
-                    addon_identifier = f" ({addon['entity_id']})"
-                
-                # Determine update criticality
-                update_type = addon.get('type', 'addon')
-                criticality = ""
-                if update_type in ['core', 'supervisor', 'os']:
-                    criticality = " [CRITICAL SYSTEM UPDATE]"
-                
-                context += f"- **{addon['name']}**{addon_identifier}{criticality}\n"
-                context += f"  - Current: {addon['current_version']} → Latest: {addon['latest_version']}\n"
-                context += f"  - Type: {update_type}\n"
-                
-                # Add repository and release info
-                if addon.get('repository'):
-                    context += f"  - Repository: {addon['repository']}\n"
-                if addon.get('release_url'):
-                    context += f"  - Release Notes: {addon['release_url']}\n"
-                if addon.get('release_summary'):
-                    full_summary = addon['release_summary']
-                    if len(full_summary) > self.MAX_RELEASE_SUMMARY_LENGTH:
-                        summary = full_summary[:self.MAX_RELEASE_SUMMARY_LENGTH] + "..."
-                    else:
-                        summary = full_summary
-                    context += f"  - Summary: {summary}\n"
-                if addon.get('description'):
-                    context += f"  - Description: {addon['description']}\n"
-                
-                # Add dependency information if available
-                dep_info = self._get_dependency_info_for_update(addon)
-                if dep_info:
-                    if dep_info.get('type') == 'system':
-                        high_risk = dep_info.get('high_risk_dependencies', [])
-                        if high_risk:
-                            context += f"  - Impact: System-wide ({dep_info.get('impact_radius', 0)} integrations)\n"
-                            context += "  - Critical Dependencies:\n"
-                            for dep in high_risk[:self.MAX_CRITICAL_DEPS_PREVIEW]:
-                                context += f"    • {dep['package']} (used by {dep['user_count']} integrations) ⚠️\n"
-                    elif dep_info.get('type') == 'integration':
-                        if dep_info.get('high_risk_count', 0) > 0:
-                            context += f"  - High-Risk Dependencies: {dep_info['high_risk_count']}\n"
-                        if dep_info.get('shared_dependency_impact', 0) > 0:
-                            context += f"  - Shared Dependency Impact: {dep_info['shared_dependency_impact']} integrations\n"
-                        requirements = dep_info.get('requirements', [])
-                        if requirements:
-                            context += "  - Key Dependencies:\n"
-                            for req in requirements[:self.MAX_KEY_DEPS_SHOWN]:
-                                risk_marker = " ⚠️" if req.get('high_risk') else ""
-                                context += f"    • {req['package']} {req['specifier']}{risk_marker}\n"
-                
-                context += "\n"
+            parts.append("## Add-on/System Updates Available:\n")
+            parts.extend(self._cached_block('addon', addon, self._format_addon_block) for addon in addon_updates)
         
         if hacs_updates:
-            context += "## HACS/Integration Updates Available:\n"
-            for hacs in hacs_updates:
-                context += f"- **{hacs['name']}**\n"
-                context += f"  - Current: {hacs['current_version']} → Latest: {hacs['latest_version']}\n"
-                
-                if hacs.get('repository'):
-                    context += f"  - Repository: {hacs['repository']}\n"
-                if hacs.get('release_url'):
-                    context += f"  - Release Notes: {hacs['release_url']}\n"
-                if hacs.get('release_summary'):
-                    full_summary = hacs['release_summary']
-                    if len(full_summary) > self.MAX_RELEASE_SUMMARY_LENGTH:
-                        summary = full_summary[:self.MAX_RELEASE_SUMMARY_LENGTH] + "..."
-                    else:
-                        summary = full_summary
-                    context += f"  - Summary: {summary}\n"
-                
-                # Add dependency information
-                dep_info = self._get_dependency_info_for_update(hacs)
-                if dep_info and dep_info.get('type') == 'integration':
-                    if dep_info.get('high_risk_count', 0) > 0:
-                        context += f"  - High-Risk Dependencies: {dep_info['high_risk_count']}\n"
-                    requirements = dep_info.get('requirements', [])
-                    if requirements:
-                        context += "  - Dependencies:\n"
-                        for req in requirements[:self.MAX_KEY_DEPS_SHOWN]:
-                            risk_marker = " ⚠️" if req.get('high_risk') else ""
-                            context += f"    • {req['package']} {req['specifier']}{risk_marker}\n"
-                
-                context += "\n"
+            parts.append("## HACS/Integration Updates Available:\n")
+            parts.extend(self._cached_block('hacs', hacs, self._format_hacs_block) for hacs in hacs_updates)
         
         if not addon_updates and not hacs_updates:
-            context += "No updates available.\n"
+            parts.append("No updates available.\n")
         
-        context += "\nPlease analyze these updates for potential conflicts, compatibility issues, and provide safety recommendations."
-        context += "\nFocus on:"
-        context += "\n- Breaking changes in high-risk dependencies (⚠️)"
-        context += "\n- Compatibility between shared dependencies"
-        context += "\n- Impact radius of system-wide updates"
-        context += "\n- Recommended installation order"
+        parts.append(
+            "\nPlease analyze these updates for potential conflicts, compatibility issues, and provide safety recommendations."
+            "\nFocus on:"
+            "\n- Breaking changes in high-risk dependencies (⚠️)"
+            "\n- Compatibility between shared dependencies"
+            "\n- Impact radius of system-wide updates"
+            "\n- Recommended installation order"
+        )
         
-        return context
+        return ''.join(parts)
+    
+    def _prepare_component_messages(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> List[str]:
+        """Prepare per-component analysis context: one user message per update"""
+        messages = [
+            "# Per-Component Update Analysis Request\n\n"
+            f"{self._format_system_context()}"
+            "Each of the following messages describes one pending update.\n"
+        ]
+        messages.extend(
+            f"## Add-on/System Update:\n{self._cached_block('addon', addon, self._format_addon_block)}"
+            for addon in addon_updates
+        )
+        messages.extend(
+            f"## HACS/Integration Update:\n{self._cached_block('hacs', hacs, self._format_hacs_block)}"
+            for hacs in hacs_updates
+        )
+        messages.append(_COMPONENT_INSTRUCTIONS)
+        return messages
     
-    def _parse_ai_response(self, ai_response: str, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
-        """Parse AI response into structured format"""
+    def _parse_component_response(self, ai_response: str) -> Optional[Dict]:
+        """
+        Parse a per-component AI response and merge the component analyses
+        
+        Returns None if the response cannot be parsed; the caller falls back to
+        dependency analysis.
+        """
+        result = _decode_first_json_object(ai_response)
+        components = result.get('components') if result is not None else None
+        if not isinstance(components, list) or not components:
+            logger.warning("Per-component AI response has no components list, parsing as a single analysis")
+            return self._parse_ai_response(ai_response)
+        
+        try:
+            results = []
+            for component in components:
+                normalized = self._normalize_ai_result(component)
+                if component.get('component'):
+                    normalized['summary'] = f"{component['component']}: {normalized['summary']}"
+                results.append(normalized)
+            logger.debug(f"Successfully parsed {len(results)} component analyses")
+            return self._merge_results(results)
+        except Exception as e:
+            logger.error(f"Failed to parse per-component AI response: {e}", exc_info=True)
+            return None
+    
+    @staticmethod
+    def _is_safe_response(ai_response: str) -> bool:
+        """Check whether an update analysis response parses to a safe verdict"""
+        result = _decode_first_json_object(ai_response)
+        if result is None:
+            return False
+        components = result.get('components')
+        if isinstance(components, list) and components:
+            return all(isinstance(c, dict) and c.get('safe', True) for c in components)
+        # Same default as _normalize_ai_result
+        return bool(result.get('safe', True))
+    
+    @staticmethod
+    def _normalize_ai_result(result: Dict) -> Dict:
+        """Validate and normalize a parsed AI analysis object"""
+        return {
+            'safe': result.get('safe', True),
+            'confidence': float(result.get('confidence', 0.7)),
+            'issues': result.get('issues', []),
+            'recommendations': result.get('recommendations', []),
+            'summary': result.get('summary', 'Analysis completed'),
+            'ai_analysis': True
+        }
+    
+    def _parse_ai_response(self, ai_response: str) -> Optional[Dict]:
+        """
+        Parse AI response into structured format
+        
+        Returns None if the response cannot be parsed; the caller falls back to
+        dependency analysis.
+        """
         try:
             logger.debug("Parsing AI response")
             # Try to extract JSON from the response
-            # The AI might wrap JSON in code blocks
-            json_start = ai_response.find('{')
-            json_end = ai_response.rfind('}') + 1
+            # The AI might wrap JSON in code blocks or surround it with prose
+            result = _decode_first_json_object(ai_response)
             
-            if json_start >= 0 and json_end > json_start:
-                json_str = ai_response[json_start:json_end]
-                result = json.loads(json_str)
-                
+            if result is not None:
                 logger.debug(f"Successfully parsed JSON response: safe={result.get('safe')}, confidence={result.get('confidence')}")
                 
                 # Validate and normalize the response
-                return {
-                    'safe': result.get('safe', True),
-                    'confidence': float(result.get('confidence', 0.7)),
-                    'issues': result.get('issues', []),
-                    'recommendations': result.get('recommendations', []),
-                    'summary': result.get('summary', 'Analysis completed'),
-                    'ai_analysis': True
-                }
+                return self._normalize_ai_result(result)
             else:
                 # If no JSON found, create a structured response from the text
                 logger.warning("No JSON found in AI response, parsing as text")
@@ -535,7 +1133,7 @@ Be thorough but concise. Focus on actionable insights."""
                 }
         except Exception as e:
             logger.error(f"Failed to parse AI response: {e}", exc_info=True)
-            return self._fallback_analysis(addon_updates, hacs_updates)
+            return None
     
     def _fallback_analysis(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
         """
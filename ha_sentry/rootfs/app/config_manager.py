@@ -10,46 +10,70 @@ logger = logging.getLogger(__name__)
 # Constants for logging formatting
 LOG_SEPARATOR_LENGTH = 60
 
+# Settings read from environment variables: (attribute, variable, type, default).
+# str.lower is used as the type for case-insensitive options.
+_ENV_SCHEMA = (
+    ('ai_enabled', 'AI_ENABLED', bool, True),
+    ('ai_provider', 'AI_PROVIDER', str, 'openai'),
+    ('ai_endpoint', 'AI_ENDPOINT', str, 'http://localhost:11434'),
+    ('ai_model', 'AI_MODEL', str, 'gpt-3.5-turbo'),
+    ('api_key', 'API_KEY', str, ''),
+    ('check_schedule', 'CHECK_SCHEDULE', str, '02:00'),
+    ('create_dashboard_entities', 'CREATE_DASHBOARD_ENTITIES', bool, True),
+    ('check_all_updates', 'CHECK_ALL_UPDATES', bool, True),
+    ('check_addons', 'CHECK_ADDONS', bool, True),
+    ('check_hacs', 'CHECK_HACS', bool, True),
+    ('safety_threshold', 'SAFETY_THRESHOLD', float, 0.7),
+    ('log_level', 'LOG_LEVEL', str.lower, 'standard'),
+    ('obfuscate_logs', 'OBFUSCATE_LOGS', bool, True),
+    ('supervisor_token', 'SUPERVISOR_TOKEN', str, ''),
+    # Dependency graph and reporting
+    ('enable_dependency_graph', 'ENABLE_DEPENDENCY_GRAPH', bool, True),
+    ('save_reports', 'SAVE_REPORTS', bool, True),
+    # Web UI configuration for dependency visualization
+    ('enable_web_ui', 'ENABLE_WEB_UI', bool, True),
+    ('port', 'PORT', int, 8099),
+    # Log monitoring configuration
+    ('monitor_logs_after_update', 'MONITOR_LOGS_AFTER_UPDATE', bool, False),
+    ('log_check_lookback_hours', 'LOG_CHECK_LOOKBACK_HOURS', int, 24),
+    # Installation review configuration
+    ('enable_installation_review', 'ENABLE_INSTALLATION_REVIEW', bool, False),
+    ('installation_review_schedule', 'INSTALLATION_REVIEW_SCHEDULE', str.lower, 'weekly'),
+    ('installation_review_scope', 'INSTALLATION_REVIEW_SCOPE', str.lower, 'full'),
+    ('installation_review_timeout', 'INSTALLATION_REVIEW_TIMEOUT', int, 1200),
+)
+
+
+# Accepted spellings for true boolean options (compared case-insensitively)
+_TRUTHY = frozenset(('true', '1', 'yes', 'on', 'y', 't'))
+
+
+def _coerce(raw: str, typ):
+    """Convert a raw environment value to the schema type"""
+    if typ is bool:
+        return raw.lower() in _TRUTHY
+    return typ(raw)
+
 
 class ConfigManager:
     """Manages add-on configuration from environment variables"""
     
+    __slots__ = tuple(attr for attr, _var, _typ, _default in _ENV_SCHEMA) + (
+        '_headers', 'custom_integration_paths', 'ha_url', 'supervisor_url'
+    )
+    
     def __init__(self):
         """Initialize configuration from environment variables"""
-        self.ai_enabled = self._get_bool_env('AI_ENABLED', True)
-        self.ai_provider = os.getenv('AI_PROVIDER', 'openai')
-        self.ai_endpoint = os.getenv('AI_ENDPOINT', 'http://localhost:11434')
-        self.ai_model = os.getenv('AI_MODEL', 'gpt-3.5-turbo')
-        self.api_key = os.getenv('API_KEY', '')
-        self.check_schedule = os.getenv('CHECK_SCHEDULE', '02:00')
-        self.create_dashboard_entities = self._get_bool_env('CREATE_DASHBOARD_ENTITIES', True)
-        self.check_all_updates = self._get_bool_env('CHECK_ALL_UPDATES', True)
-        self.check_addons = self._get_bool_env('CHECK_ADDONS', True)
-        self.check_hacs = self._get_bool_env('CHECK_HACS', True)
-        self.safety_threshold = float(os.getenv('SAFETY_THRESHOLD', '0.7'))
-        self.log_level = os.getenv('LOG_LEVEL', 'standard').lower()
-        self.obfuscate_logs = self._get_bool_env('OBFUSCATE_LOGS', True)
-        self.supervisor_token = os.getenv('SUPERVISOR_TOKEN', '')
-        
-        # New configuration options for dependency graph and reporting
-        self.enable_dependency_graph = self._get_bool_env('ENABLE_DEPENDENCY_GRAPH', True)
-        self.save_reports = self._get_bool_env('SAVE_REPORTS', True)
+        env = os.environ
+        for attr, var, typ, default in _ENV_SCHEMA:
+            raw = env.get(var)
+            setattr(self, attr, default if raw is None else _coerce(raw, typ))
+        self._headers = {
+            'Authorization': f'Bearer {self.supervisor_token}',
+            'Content-Type': 'application/json'
+        }
         self.custom_integration_paths = self._parse_custom_paths()
         
-        # Web UI configuration for dependency visualization
-        self.enable_web_ui = self._get_bool_env('ENABLE_WEB_UI', True)
-        self.port = int(os.getenv('PORT', '8099'))
-        
-        # Log monitoring configuration
-        self.monitor_logs_after_update = self._get_bool_env('MONITOR_LOGS_AFTER_UPDATE', False)
-        self.log_check_lookback_hours = int(os.getenv('LOG_CHECK_LOOKBACK_HOURS', '24'))
-        
-        # Installation review configuration
-        self.enable_installation_review = self._get_bool_env('ENABLE_INSTALLATION_REVIEW', False)
-        self.installation_review_schedule = os.getenv('INSTALLATION_REVIEW_SCHEDULE', 'weekly').lower()
-        self.installation_review_scope = os.getenv('INSTALLATION_REVIEW_SCOPE', 'full').lower()
-        self.installation_review_timeout = int(os.getenv('INSTALLATION_REVIEW_TIMEOUT', '1200'))
-        
         # Validate configuration consistency
         self._validate_config()
         
@@ -147,11 +171,6 @@ class ConfigManager:
         else:
             logger.debug("Configuration validation passed")
     
-    def _get_bool_env(self, key: str, default: bool) -> bool:
-        """Get boolean value from environment variable"""
-        value = os.getenv(key, str(default)).lower()
-        return value in ('true', '1', 'yes', 'on')
-    
     def _parse_custom_paths(self) -> list:
         """Parse custom integration paths from environment variable"""
         paths_json = os.getenv('CUSTOM_INTEGRATION_PATHS', '[]')
@@ -182,8 +201,5 @@ class ConfigManager:
     
     @property
     def headers(self):
-        """Get API headers for Home Assistant"""
-        return {
-            'Authorization': f'Bearer {self.supervisor_token}',
-            'Content-Type': 'application/json'
-        }
+        """Get API headers for Home Assistant (built once at startup)"""
+        return self._headers
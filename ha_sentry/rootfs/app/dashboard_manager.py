@@ -2,15 +2,98 @@
 Dashboard Manager - Creates and updates Home Assistant entities
 """
 import logging
+from collections import defaultdict
 from datetime import datetime
+from itertools import chain, islice
 from typing import Dict, List
 
+from issue_severity import SEVERITY_LEVELS, count_severities
+
 logger = logging.getLogger(__name__)
 
+# The dashboard view configuration from the documentation
+_DASHBOARD_VIEW = {
+    "title": "Sentry",
+    "path": "sentry",
+    "icon": "mdi:shield-check",
+    "cards": [
+        {
+            "type": "vertical-stack",
+            "cards": [
+                {
+                    "type": "entities",
+                    "title": "Home Assistant Sentry",
+                    "entities": [
+                        {
+                            "entity": "sensor.ha_sentry_update_status",
+                            "name": "Status"
+                        },
+                        {
+                            "entity": "sensor.ha_sentry_updates_available",
+                            "name": "Updates Available"
+                        },
+                        {
+                            "entity": "sensor.ha_sentry_confidence",
+                            "name": "Confidence"
+                        },
+                        {
+                            "entity": "sensor.ha_sentry_issues",
+                            "name": "Issues Detected"
+                        }
+                    ]
+                },
+                {
+                    "type": "conditional",
+                    "conditions": [
+                        {
+                            "entity": "sensor.ha_sentry_issues",
+                            "state_not": "0"
+                        }
+                    ],
+                    "card": {
+                        "type": "markdown",
+                        "content": "## ⚠️ Issues Detected\n\nReview the persistent notification for details."
+                    }
+                },
+                {
+                    "type": "entities",
+                    "title": "Update Details",
+                    "entities": [
+                        {
+                            "entity": "sensor.ha_sentry_addon_updates",
+                            "name": "Add-on Updates"
+                        },
+                        {
+                            "entity": "sensor.ha_sentry_hacs_updates",
+                            "name": "HACS Updates"
+                        }
+                    ]
+                }
+            ]
+        }
+    ]
+}
+
+# Default Sentry dashboard; never modified, so it is shared between calls
+_DASHBOARD_CONFIG = {
+    "url_path": "ha-sentry",
+    "title": "Home Assistant Sentry",
+    "icon": "mdi:shield-check",
+    "show_in_sidebar": True,
+    "require_admin": False,
+    "config": {
+        "views": [_DASHBOARD_VIEW]
+    }
+}
+
 
 class DashboardManager:
     """Manages Home Assistant dashboard entities for Sentry"""
     
+    # Home Assistant caps state attributes at 16 KB, so only the first issues
+    # are listed on the issues sensor
+    MAX_ISSUES_IN_ATTRIBUTES = 25
+    
     def __init__(self, ha_client):
         """Initialize dashboard manager"""
         self.ha_client = ha_client
@@ -18,112 +101,134 @@ class DashboardManager:
     async def update_sensors(self, addon_updates: List[Dict], 
                             hacs_updates: List[Dict], 
                             analysis: Dict):
-        """Update all sensor entities with current status"""
+        """Update all sensor entities with current status
+        
+        All sensors share one timestamp and are handed to the HA client in a
+        single bulk call rather than one round-trip at a time.
+        """
         total_updates = len(addon_updates) + len(hacs_updates)
         safe = analysis['safe']
         confidence = analysis['confidence']
-        
-        # Main status sensor
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_update_status',
-            'safe' if safe else 'review_required',
-            {
-                'friendly_name': 'HA Sentry Update Status',
-                'icon': 'mdi:shield-check' if safe else 'mdi:shield-alert',
-                'last_check': datetime.now().isoformat(),
-                'updates_available': total_updates,
-                'safe_to_update': safe,
-                'confidence': confidence,
-                'ai_enabled': analysis.get('ai_analysis', False)
-            }
-        )
-        
-        # Update count sensor
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_updates_available',
-            str(total_updates),
-            {
-                'friendly_name': 'Updates Available',
-                'icon': 'mdi:package-up',
-                'unit_of_measurement': 'updates',
-                'addon_updates': len(addon_updates),
-                'hacs_updates': len(hacs_updates),
-                'last_check': datetime.now().isoformat()
-            }
-        )
-        
-        # Add-on updates sensor
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_addon_updates',
-            str(len(addon_updates)),
-            {
-                'friendly_name': 'Add-on Updates',
-                'icon': 'mdi:puzzle',
-                'unit_of_measurement': 'updates',
-                'addons': [
-                    {
-                        'name': a['name'],
-                        'current': a['current_version'],
-                        'latest': a['latest_version']
-                    } for a in addon_updates
-                ],
-                'last_check': datetime.now().isoformat()
-            }
-        )
-        
-        # HACS updates sensor
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_hacs_updates',
-            str(len(hacs_updates)),
-            {
-                'friendly_name': 'HACS Updates',
-                'icon': 'mdi:home-assistant',
-                'unit_of_measurement': 'updates',
-                'integrations': [
-                    {
-                        'name': h['name'],
-                        'current': h['current_version'],
-                        'latest': h['latest_version']
-                    } for h in hacs_updates
-                ],
-                'last_check': datetime.now().isoformat()
-            }
-        )
-        
-        # Issues sensor
+        now = datetime.now().isoformat()
         issues = analysis.get('issues', [])
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_issues',
-            str(len(issues)),
-            {
-                'friendly_name': 'Sentry Issues Detected',
-                'icon': 'mdi:alert-circle',
-                'unit_of_measurement': 'issues',
-                'critical': len([i for i in issues if i.get('severity') == 'critical']),
-                'high': len([i for i in issues if i.get('severity') == 'high']),
-                'medium': len([i for i in issues if i.get('severity') == 'medium']),
-                'low': len([i for i in issues if i.get('severity') == 'low']),
-                'issues_list': issues,
-                'last_check': datetime.now().isoformat()
-            }
-        )
+        # Both the AI client and the dependency analyzer report severity counts;
+        # only rescan issues for analysis dicts built elsewhere
+        severity_counts = analysis.get('severity_counts') or count_severities(issues)
         
-        # Confidence sensor
-        await self.ha_client.set_sensor_state(
-            'sensor.ha_sentry_confidence',
-            f"{confidence * 100:.0f}",
-            {
-                'friendly_name': 'Analysis Confidence',
-                'icon': 'mdi:gauge',
-                'unit_of_measurement': '%',
-                'confidence_decimal': f"{confidence:.2f}",
-                'last_check': datetime.now().isoformat()
-            }
-        )
+        states = [
+            # Main status sensor
+            (
+                'sensor.ha_sentry_update_status',
+                'safe' if safe else 'review_required',
+                {
+                    'friendly_name': 'HA Sentry Update Status',
+                    'icon': 'mdi:shield-check' if safe else 'mdi:shield-alert',
+                    'last_check': now,
+                    'updates_available': total_updates,
+                    'safe_to_update': safe,
+                    'confidence': confidence,
+                    'ai_enabled': analysis.get('ai_analysis', False)
+                }
+            ),
+            # Update count sensor
+            (
+                'sensor.ha_sentry_updates_available',
+                str(total_updates),
+                {
+                    'friendly_name': 'Updates Available',
+                    'icon': 'mdi:package-up',
+                    'unit_of_measurement': 'updates',
+                    'addon_updates': len(addon_updates),
+                    'hacs_updates': len(hacs_updates),
+                    'last_check': now
+                }
+            ),
+            # Add-on updates sensor
+            (
+                'sensor.ha_sentry_addon_updates',
+                str(len(addon_updates)),
+                {
+                    'friendly_name': 'Add-on Updates',
+                    'icon': 'mdi:puzzle',
+                    'unit_of_measurement': 'updates',
+                    'addons': [
+                        {
+                            'name': a['name'],
+                            'current': a['current_version'],
+                            'latest': a['latest_version']
+                        } for a in addon_updates
+                    ],
+                    'last_check': now
+                }
+            ),
+            # HACS updates sensor
+            (
+                'sensor.ha_sentry_hacs_updates',
+                str(len(hacs_updates)),
+                {
+                    'friendly_name': 'HACS Updates',
+                    'icon': 'mdi:home-assistant',
+                    'unit_of_measurement': 'updates',
+                    'integrations': [
+                        {
+                            'name': h['name'],
+                            'current': h['current_version'],
+                            'latest': h['latest_version']
+                        } for h in hacs_updates
+                    ],
+                    'last_check': now
+                }
+            ),
+            # Issues sensor
+            (
+                'sensor.ha_sentry_issues',
+                str(len(issues)),
+                {
+                    'friendly_name': 'Sentry Issues Detected',
+                    'icon': 'mdi:alert-circle',
+                    'unit_of_measurement': 'issues',
+                    'critical': severity_counts['critical'],
+                    'high': severity_counts['high'],
+                    'medium': severity_counts['medium'],
+                    'low': severity_counts['low'],
+                    'issues_list': self._most_severe_issues(issues),
+                    'issues_truncated': max(0, len(issues) - self.MAX_ISSUES_IN_ATTRIBUTES),
+                    'last_check': now
+                }
+            ),
+            # Confidence sensor
+            (
+                'sensor.ha_sentry_confidence',
+                f"{confidence * 100:.0f}",
+                {
+                    'friendly_name': 'Analysis Confidence',
+                    'icon': 'mdi:gauge',
+                    'unit_of_measurement': '%',
+                    'confidence_decimal': f"{confidence:.2f}",
+                    'last_check': now
+                }
+            ),
+        ]
+        
+        await self.ha_client.set_sensor_states_bulk(states)
         
         logger.info("✅ Dashboard sensors updated successfully!")
         logger.info("📊 View your sensors at: Developer Tools > States > Search 'sensor.ha_sentry'")
     
+    def _most_severe_issues(self, issues: List[Dict]) -> List[Dict]:
+        """Return the issues to list on the sensor, most severe first when truncating"""
+        if len(issues) <= self.MAX_ISSUES_IN_ATTRIBUTES:
+            return issues
+        
+        # Group in one pass so critical and high issues are never cut off by
+        # lower-severity ones that happen to come first
+        by_severity = defaultdict(list)
+        for issue in issues:
+            by_severity[issue.get('severity')].append(issue)
+        ordered = [by_severity.pop(level, ()) for level in SEVERITY_LEVELS]
+        ordered.extend(by_severity.values())
+        return list(islice(chain.from_iterable(ordered), self.MAX_ISSUES_IN_ATTRIBUTES))
+    
     async def create_sentry_dashboard(self):
         """Create the default Sentry dashboard in Lovelace
         
@@ -135,80 +240,4 @@ class DashboardManager:
         logger.warning("This will likely fail - please use the WebUI instead")
         logger.info("Attempting dashboard creation anyway (for backward compatibility)...")
         
-        dashboard_config = {
-            "url_path": "ha-sentry",
-            "title": "Home Assistant Sentry",
-            "icon": "mdi:shield-check",
-            "show_in_sidebar": True,
-            "require_admin": False
-        }
-        
-        # The dashboard view configuration from the documentation
-        dashboard_view = {
-            "title": "Sentry",
-            "path": "sentry",
-            "icon": "mdi:shield-check",
-            "cards": [
-                {
-                    "type": "vertical-stack",
-                    "cards": [
-                        {
-                            "type": "entities",
-                            "title": "Home Assistant Sentry",
-                            "entities": [
-                                {
-                                    "entity": "sensor.ha_sentry_update_status",
-                                    "name": "Status"
-                                },
-                                {
-                                    "entity": "sensor.ha_sentry_updates_available",
-                                    "name": "Updates Available"
-                                },
-                                {
-                                    "entity": "sensor.ha_sentry_confidence",
-                                    "name": "Confidence"
-                                },
-                                {
-                                    "entity": "sensor.ha_sentry_issues",
-                                    "name": "Issues Detected"
-                                }
-                            ]
-                        },
-                        {
-                            "type": "conditional",
-                            "conditions": [
-                                {
-                                    "entity": "sensor.ha_sentry_issues",
-                                    "state_not": "0"
-                                }
-                            ],
-                            "card": {
-                                "type": "markdown",
-                                "content": "## ⚠️ Issues Detected\n\nReview the persistent notification for details."
-                            }
-                        },
-                        {
-                            "type": "entities",
-                            "title": "Update Details",
-                            "entities": [
-                                {
-                                    "entity": "sensor.ha_sentry_addon_updates",
-                                    "name": "Add-on Updates"
-                                },
-                                {
-                                    "entity": "sensor.ha_sentry_hacs_updates",
-                                    "name": "HACS Updates"
-                                }
-                            ]
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        # Store the view configuration in the dashboard config
-        dashboard_config["config"] = {
-            "views": [dashboard_view]
-        }
-        
-        return await self.ha_client.create_lovelace_dashboard(dashboard_config)
+        return await self.ha_client.create_lovelace_dashboard(_DASHBOARD_CONFIG)
@@ -3,23 +3,84 @@ Deep Dependency Analysis without AI
 Analyzes update conflicts using version parsing and heuristic rules
 Now enhanced with dependency graph analysis for shared dependency detection
 """
+import copy
 import logging
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from packaging import version
 from itertools import chain
 
+from issue_severity import count_severities
+
 logger = logging.getLogger(__name__)
 
+# Markers that identify a pre-release version string
+_PRERELEASE_RE = re.compile(r'alpha|beta|rc|dev|pre', re.IGNORECASE)
+
+# Plain dotted release numbers, whose major version needs no full parse
+_PLAIN_VERSION_RE = re.compile(r'\d+(?:\.\d+)*', re.ASCII)
+
+# Placeholder specifiers that do not constrain a dependency's version
+_UNKNOWN_SPECIFIERS = frozenset({'any', 'unknown'})
+
+
+@lru_cache(maxsize=8192)
+def _parse_version(version_str: str) -> Optional[version.Version]:
+    """Parse a version string once, or return None if it is not PEP 440
+    
+    Invalid strings (commit hashes, '2.0.0-beta.1', ...) are common in HACS
+    updates, so failures are cached as well.
+    """
+    try:
+        return version.parse(version_str)
+    except (TypeError, version.InvalidVersion) as e:
+        # Lazy formatting: invalid versions are common and debug is usually off
+        logger.debug("Version parsing failed: %s", e)
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _is_prerelease(version_str: str) -> bool:
+    """Check if version is a pre-release"""
+    # Plain release numbers such as '1.2.3' never are; skip parsing them
+    if not version_str or (isinstance(version_str, str) and _PLAIN_VERSION_RE.fullmatch(version_str)):
+        return False
+    parsed = _parse_version(version_str)
+    if parsed is not None:
+        return parsed.is_prerelease
+    # Not PEP 440 (e.g. '2.0.0-beta.1'); look for pre-release markers instead
+    return _PRERELEASE_RE.search(version_str) is not None
+
+
+@lru_cache(maxsize=4096)
+def _get_version_jump_size(current: str, latest: str) -> int:
+    """Calculate how many major versions are being jumped
+    
+    A positive result means the update is a major version bump.
+    """
+    # Most versions look like '1.2.3', so read the major number directly
+    if (isinstance(current, str) and isinstance(latest, str)
+            and _PLAIN_VERSION_RE.fullmatch(current) and _PLAIN_VERSION_RE.fullmatch(latest)):
+        return int(latest.partition('.')[0]) - int(current.partition('.')[0])
+    
+    current_parsed = _parse_version(current)
+    latest_parsed = _parse_version(latest)
+    if current_parsed is None or latest_parsed is None:
+        return 0
+    return latest_parsed.major - current_parsed.major
+
 
 class DependencyAnalyzer:
     """Performs deep dependency analysis without AI"""
     
     # High-risk libraries to highlight (aligned with dependency_graph_builder)
-    HIGH_RISK_LIBRARIES = {
+    HIGH_RISK_LIBRARIES = frozenset({
         'aiohttp', 'cryptography', 'numpy', 'pyjwt', 
         'sqlalchemy', 'protobuf', 'requests', 'urllib3'
-    }
+    })
     
     # Maximum number of components to display in recommendations
     MAX_DISPLAYED_COMPONENTS = 5
@@ -28,30 +89,42 @@ class DependencyAnalyzer:
     CONFLICT_PATTERNS = {
         'mariadb': {
             'major_version_change': True,
-            'affected_addons': ['homeassistant', 'influxdb', 'grafana'],
+            'affected_addons': ('homeassistant', 'influxdb', 'grafana'),
             'warning': 'Database schema changes may require migration'
         },
         'postgresql': {
             'major_version_change': True,
-            'affected_addons': ['homeassistant', 'grafana', 'pgadmin'],
+            'affected_addons': ('homeassistant', 'grafana', 'pgadmin'),
             'warning': 'PostgreSQL major upgrades require data migration'
         },
         'mosquitto': {
             'major_version_change': True,
-            'affected_addons': ['zigbee2mqtt', 'zwave', 'node-red'],
+            'affected_addons': ('zigbee2mqtt', 'zwave', 'node-red'),
             'warning': 'MQTT broker changes may affect IoT devices'
         },
         'node-red': {
             'major_version_change': True,
-            'affected_addons': [],
+            'affected_addons': (),
             'warning': 'Node-RED major updates may break custom flows'
         }
     }
     
+    # Single alternation over all pattern keys so each slug is scanned once
+    _CONFLICT_PATTERN_RE = re.compile('|'.join(map(re.escape, CONFLICT_PATTERNS)))
+    
+    # "Check compatibility with" recommendations, formatted once per pattern
+    _COMPATIBILITY_NOTES = {
+        pattern_key: f"Check compatibility with: {', '.join(pattern_info['affected_addons'])}"
+        for pattern_key, pattern_info in CONFLICT_PATTERNS.items()
+        if pattern_info['affected_addons']
+    }
+    
     # Core integrations that often conflict
-    CORE_INTEGRATIONS = [
+    CORE_INTEGRATIONS = frozenset({
         'homeassistant', 'hacs', 'esphome', 'zigbee2mqtt', 'zwavejs'
-    ]
+    })
+    
+    RESULT_CACHE_MAX_ENTRIES = 64  # Recent results keyed by update set
     
     def __init__(self, dependency_graph=None):
         """Initialize the analyzer
@@ -59,54 +132,148 @@ class DependencyAnalyzer:
         Args:
             dependency_graph: Optional dependency graph data from DependencyGraphBuilder
         """
+        # Analyses may run in worker threads (AIClient's fallback uses
+        # asyncio.to_thread) while the graph is replaced on the event loop
+        self._graph_lock = threading.Lock()
         self.dependency_graph = dependency_graph
     
+    @property
+    def dependency_graph(self):
+        """Dependency graph data from DependencyGraphBuilder"""
+        return self._dependency_graph
+    
+    @dependency_graph.setter
+    def dependency_graph(self, graph):
+        """
+        Set the dependency graph and rebuild the views derived from it
+        
+        The views are built first and swapped in together under the graph lock,
+        so a running analysis sees either the old graph or the new one.
+        """
+        shared_deps, high_risk_shared, integrations_lower, notable_shared_deps = \
+            self._build_graph_views(graph)
+        with self._graph_lock:
+            self._dependency_graph = graph
+            self._result_cache = OrderedDict()
+            self._shared_deps = shared_deps
+            self._high_risk_shared = high_risk_shared
+            self._integrations_lower = integrations_lower
+            self._notable_shared_deps = notable_shared_deps
+    
+    def _build_graph_views(self, graph) -> Tuple[Dict, frozenset, Dict, Dict]:
+        """
+        Derive the lookup structures the analysis reads from a dependency graph
+        
+        Returns:
+            Tuple of (shared dependencies, high-risk shared package names,
+            integrations by lowercased domain, notable shared dependencies)
+        """
+        # Dependencies with more than one user, and the high-risk ones among them.
+        # Precomputed by DependencyGraphBuilder; graphs built elsewhere may lack it
+        shared_deps = {}
+        high_risk_shared = frozenset()
+        # Integrations by lowercased domain, matched against updating components
+        integrations_lower = {}
+        if graph:
+            for domain, integration_data in graph.get('integrations', {}).items():
+                integrations_lower.setdefault(domain.lower(), []).append(integration_data)
+            
+            shared_deps = graph.get('shared_dependency_map')
+            if shared_deps is None:
+                shared_deps = {
+                    package: users
+                    for package, users in graph.get('dependency_map', {}).items()
+                    if len(users) > 1
+                }
+            high_risk_shared = frozenset(shared_deps.keys() & self.HIGH_RISK_LIBRARIES)
+        
+        # Only high-risk or conflicting shared dependencies produce findings;
+        # maps each to its (user names, constraining specifiers)
+        notable_shared_deps = {}
+        dependency_summary = graph.get('dependency_summary', {}) if graph else {}
+        for package, users in shared_deps.items():
+            summary = dependency_summary.get(package)
+            if summary is not None:
+                affected_integrations = summary['integrations']
+                all_specifiers = summary['specifiers']
+            else:
+                affected_integrations = tuple(u['integration'] for u in users)
+                all_specifiers = frozenset(u['specifier'] for u in users)
+            
+            specifiers = all_specifiers - _UNKNOWN_SPECIFIERS
+            if package in high_risk_shared or len(specifiers) > 1:
+                notable_shared_deps[package] = (affected_integrations, specifiers)
+        
+        return shared_deps, high_risk_shared, integrations_lower, notable_shared_deps
+    
     def analyze_updates(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
         """
         Perform deep dependency analysis on updates
         
+        The analysis only depends on the updates and the dependency graph, so
+        results for a recently seen update set are reused. It holds the graph
+        lock throughout, so the graph cannot be swapped halfway through and a
+        result is only cached alongside the graph it was computed from.
+        
         Returns:
             Dict with keys: safe, confidence, issues, recommendations, summary
         """
+        result_key = self._result_cache_key(addon_updates, hacs_updates)
+        with self._graph_lock:
+            cached = self._result_cache.get(result_key)
+            if cached is not None:
+                self._result_cache.move_to_end(result_key)
+                logger.debug("Update set unchanged, reusing previous dependency analysis")
+                return copy.deepcopy(cached)
+            
+            result = self._analyze_updates(addon_updates, hacs_updates)
+            self._result_cache[result_key] = copy.deepcopy(result)
+            while len(self._result_cache) > self.RESULT_CACHE_MAX_ENTRIES:
+                self._result_cache.popitem(last=False)
+            return result
+    
+    @staticmethod
+    def _result_cache_key(addon_updates: List[Dict], hacs_updates: List[Dict]) -> Tuple:
+        """Identify an update set by every field the analysis reads"""
+        return tuple(
+            tuple(
+                (u.get('slug'), u.get('name'), u.get('type'),
+                 u.get('current_version'), u.get('latest_version'))
+                for u in updates
+            )
+            for updates in (addon_updates, hacs_updates)
+        )
+    
+    def _analyze_updates(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
+        """Run every check on the updates (see analyze_updates)"""
+        # Every check appends its findings to these lists in place
         issues = []
         recommendations = []
+        # Breaking-change findings are reported after the other per-update findings
+        breaking_issues = []
+        breaking_recommendations = []
         total_updates = len(addon_updates) + len(hacs_updates)
         
         # 1. Check update volume
-        volume_issues = self._check_update_volume(total_updates)
-        issues.extend(volume_issues['issues'])
-        recommendations.extend(volume_issues['recommendations'])
-        
-        # 2. Analyze add-on version changes
-        addon_issues = self._analyze_addon_updates(addon_updates)
-        issues.extend(addon_issues['issues'])
-        recommendations.extend(addon_issues['recommendations'])
-        
-        # 3. Check for simultaneous critical updates
-        simultaneous_issues = self._check_simultaneous_critical_updates(addon_updates)
-        issues.extend(simultaneous_issues['issues'])
-        recommendations.extend(simultaneous_issues['recommendations'])
-        
-        # 4. Analyze HACS updates for known conflicts
-        hacs_issues = self._analyze_hacs_updates(hacs_updates)
-        issues.extend(hacs_issues['issues'])
-        recommendations.extend(hacs_issues['recommendations'])
-        
-        # 5. Check for breaking changes based on version jumps
-        breaking_issues = self._check_breaking_changes(addon_updates, hacs_updates)
-        issues.extend(breaking_issues['issues'])
-        recommendations.extend(breaking_issues['recommendations'])
+        self._check_update_volume(total_updates, issues, recommendations)
+        
+        # 2-5. Scan each add-on and HACS update once for version conflicts,
+        # simultaneous critical updates and breaking changes
+        self._scan_addons(addon_updates, issues, recommendations,
+                          breaking_issues, breaking_recommendations)
+        self._scan_hacs(hacs_updates, issues, recommendations,
+                        breaking_issues, breaking_recommendations)
+        issues.extend(breaking_issues)
+        recommendations.extend(breaking_recommendations)
         
         # 6. Analyze shared dependency risks (Feature 2 - NEW)
         if self.dependency_graph:
-            shared_dep_issues = self._analyze_shared_dependency_risks()
-            issues.extend(shared_dep_issues['issues'])
-            recommendations.extend(shared_dep_issues['recommendations'])
+            self._analyze_shared_dependency_risks(issues, recommendations)
         
         # Determine overall safety
-        critical_count = len([i for i in issues if i['severity'] == 'critical'])
-        high_count = len([i for i in issues if i['severity'] == 'high'])
-        medium_count = len([i for i in issues if i['severity'] == 'medium'])
+        severity_counts = count_severities(issues)
+        critical_count = severity_counts['critical']
+        high_count = severity_counts['high']
         
         # Calculate confidence based on analysis depth
         confidence = self._calculate_confidence(issues, total_updates)
@@ -116,7 +283,7 @@ class DependencyAnalyzer:
         
         # Generate enhanced summary with component breakdown and dependency information
         summary = self._generate_summary(
-            total_updates, issues, safe, addon_updates, hacs_updates
+            total_updates, severity_counts, safe, addon_updates, hacs_updates
         )
         
         # Add detailed recommendations based on what was analyzed
@@ -130,16 +297,15 @@ class DependencyAnalyzer:
             'safe': safe,
             'confidence': confidence,
             'issues': issues,
-            'recommendations': list(set(recommendations)),  # Remove duplicates
+            'recommendations': list(dict.fromkeys(recommendations)),  # Remove duplicates, keep order
             'summary': summary,
+            'severity_counts': severity_counts,
             'ai_analysis': False
         }
     
-    def _check_update_volume(self, total_updates: int) -> Dict:
+    def _check_update_volume(self, total_updates: int, issues: List[Dict],
+                             recommendations: List[str]):
         """Check if too many updates at once"""
-        issues = []
-        recommendations = []
-        
         if total_updates > 15:
             issues.append({
                 'severity': 'high',
@@ -157,13 +323,19 @@ class DependencyAnalyzer:
                 'impact': 'Installing many updates at once may complicate troubleshooting'
             })
             recommendations.append('Consider installing updates in smaller batches')
-        
-        return {'issues': issues, 'recommendations': recommendations}
     
-    def _analyze_addon_updates(self, addon_updates: List[Dict]) -> Dict:
-        """Analyze add-on updates for conflicts"""
-        issues = []
-        recommendations = []
+    def _scan_addons(self, addon_updates: List[Dict], issues: List[Dict],
+                     recommendations: List[str], breaking_issues: List[Dict],
+                     breaking_recommendations: List[str]):
+        """
+        Analyze add-on updates in a single pass
+        
+        Each add-on's slug is lowered and matched against the conflict
+        patterns once, and its versions are checked once, instead of walking
+        the list separately for every check. Breaking-change findings go to
+        their own lists so the caller can report them after the HACS checks.
+        """
+        critical_updates = []
         
         for addon in addon_updates:
             addon_slug = addon.get('slug', '').lower()
@@ -171,58 +343,25 @@ class DependencyAnalyzer:
             latest_ver = addon.get('latest_version', '')
             # Get the type from the addon update if available, default to 'addon'
             component_type = addon.get('type', 'addon')
+            # Parse the versions once for every check below
+            jump_size = _get_version_jump_size(current_ver, latest_ver)
             
             # Check if this is a known critical addon
-            for pattern_key, pattern_info in self.CONFLICT_PATTERNS.items():
-                if pattern_key in addon_slug:
-                    # Check for major version change
-                    if pattern_info.get('major_version_change'):
-                        is_major_change = self._is_major_version_change(current_ver, latest_ver)
-                        
-                        if is_major_change:
-                            issues.append({
-                                'severity': 'high',
-                                'component': addon['name'],
-                                'component_type': component_type,
-                                'description': f"Major version update: {current_ver} → {latest_ver}",
-                                'impact': pattern_info['warning']
-                            })
-                            recommendations.append(f"Backup before updating {addon['name']}")
-                            recommendations.append(f"Review {addon['name']} changelog for breaking changes")
-                            recommendations.append(f"Plan for potential downtime with {addon['name']}")
-                            
-                            # Check for affected add-ons
-                            if pattern_info.get('affected_addons'):
-                                affected = ', '.join(pattern_info['affected_addons'])
-                                recommendations.append(
-                                    f"Check compatibility with: {affected}"
-                                )
-                        else:
-                            # Minor update to critical service
-                            issues.append({
-                                'severity': 'medium',
-                                'component': addon['name'],
-                                'component_type': component_type,
-                                'description': f"Core service update: {current_ver} → {latest_ver}",
-                                'impact': 'May require dependent service restarts'
-                            })
-                            recommendations.append(f"Monitor {addon['name']} after update")
-        
-        return {'issues': issues, 'recommendations': recommendations}
-    
-    def _check_simultaneous_critical_updates(self, addon_updates: List[Dict]) -> Dict:
-        """Check if multiple critical services are updating at once"""
-        issues = []
-        recommendations = []
-        
-        critical_updates = []
-        for addon in addon_updates:
-            addon_slug = addon.get('slug', '').lower()
-            for pattern_key in self.CONFLICT_PATTERNS.keys():
-                if pattern_key in addon_slug:
-                    critical_updates.append(addon['name'])
-                    break
+            pattern_keys = self._match_conflict_patterns(addon_slug)
+            if pattern_keys:
+                critical_updates.append(addon['name'])
+            for pattern_key in pattern_keys:
+                self._check_conflict_pattern(
+                    addon, pattern_key, current_ver, latest_ver, jump_size, component_type,
+                    issues, recommendations
+                )
+            
+            self._check_breaking_change(
+                addon, current_ver, latest_ver, jump_size, component_type,
+                breaking_issues, breaking_recommendations
+            )
         
+        # Check if multiple critical services are updating at once
         if len(critical_updates) >= 2:
             issues.append({
                 'severity': 'high',
@@ -232,14 +371,59 @@ class DependencyAnalyzer:
             })
             recommendations.append('Update critical services one at a time')
             recommendations.append('Verify each service is working before updating the next')
-        
-        return {'issues': issues, 'recommendations': recommendations}
     
-    def _analyze_hacs_updates(self, hacs_updates: List[Dict]) -> Dict:
-        """Analyze HACS integration updates"""
-        issues = []
-        recommendations = []
+    def _match_conflict_patterns(self, addon_slug: str) -> List[str]:
+        """Return the CONFLICT_PATTERNS keys found in an add-on slug"""
+        # Add-on slugs are usually '<repository>_<name>' (e.g. 'core_mariadb'),
+        # so try an exact lookup on the name; it is the only match unless the
+        # repository part contains a pattern too (keys contain no '_')
+        prefix, _, canonical_slug = addon_slug.rpartition('_')
+        if canonical_slug in self.CONFLICT_PATTERNS and not self._CONFLICT_PATTERN_RE.search(prefix):
+            return [canonical_slug]
+        found = {match.group() for match in self._CONFLICT_PATTERN_RE.finditer(addon_slug)}
+        # Report matches in CONFLICT_PATTERNS order, as checking each key did
+        return [pattern_key for pattern_key in self.CONFLICT_PATTERNS if pattern_key in found]
+    
+    def _check_conflict_pattern(self, addon: Dict, pattern_key: str, current_ver: str,
+                                latest_ver: str, jump_size: int, component_type: str,
+                                issues: List[Dict], recommendations: List[str]):
+        """Record issues for an add-on matching a known critical pattern"""
+        pattern_info = self.CONFLICT_PATTERNS[pattern_key]
+        
+        # Check for major version change
+        if not pattern_info.get('major_version_change'):
+            return
         
+        if jump_size > 0:
+            issues.append({
+                'severity': 'high',
+                'component': addon['name'],
+                'component_type': component_type,
+                'description': f"Major version update: {current_ver} → {latest_ver}",
+                'impact': pattern_info['warning']
+            })
+            recommendations.append(f"Backup before updating {addon['name']}")
+            recommendations.append(f"Review {addon['name']} changelog for breaking changes")
+            recommendations.append(f"Plan for potential downtime with {addon['name']}")
+            
+            # Check for affected add-ons
+            if pattern_key in self._COMPATIBILITY_NOTES:
+                recommendations.append(self._COMPATIBILITY_NOTES[pattern_key])
+        else:
+            # Minor update to critical service
+            issues.append({
+                'severity': 'medium',
+                'component': addon['name'],
+                'component_type': component_type,
+                'description': f"Core service update: {current_ver} → {latest_ver}",
+                'impact': 'May require dependent service restarts'
+            })
+            recommendations.append(f"Monitor {addon['name']} after update")
+    
+    def _scan_hacs(self, hacs_updates: List[Dict], issues: List[Dict],
+                   recommendations: List[str], breaking_issues: List[Dict],
+                   breaking_recommendations: List[str]):
+        """Analyze HACS integration updates in a single pass"""
         # HACS integrations share the Home Assistant Python environment
         # Multiple updates increase risk of dependency conflicts
         if len(hacs_updates) > 5:
@@ -253,14 +437,15 @@ class DependencyAnalyzer:
             recommendations.append('Update HACS integrations one at a time')
             recommendations.append('Check Home Assistant logs for Python dependency warnings')
         
-        # Check for major version updates in HACS
         for hacs in hacs_updates:
             current_ver = hacs.get('current_version', '')
             latest_ver = hacs.get('latest_version', '')
             # Get the type from the hacs update if available, default to 'hacs'
             component_type = hacs.get('type', 'hacs')
+            jump_size = _get_version_jump_size(current_ver, latest_ver)
             
-            if self._is_major_version_change(current_ver, latest_ver):
+            # Check for major version updates in HACS
+            if jump_size > 0:
                 issues.append({
                     'severity': 'medium',
                     'component': hacs['name'],
@@ -269,85 +454,58 @@ class DependencyAnalyzer:
                     'impact': 'Breaking changes may affect automations or dashboards'
                 })
                 recommendations.append(f"Review {hacs['name']} release notes before updating")
-        
-        return {'issues': issues, 'recommendations': recommendations}
+            
+            self._check_breaking_change(
+                hacs, current_ver, latest_ver, jump_size, component_type,
+                breaking_issues, breaking_recommendations
+            )
     
-    def _check_breaking_changes(self, addon_updates: List[Dict], hacs_updates: List[Dict]) -> Dict:
+    def _check_breaking_change(self, update: Dict, current: str, latest: str, jump_size: int,
+                               component_type: str, issues: List[Dict],
+                               recommendations: List[str]):
         """Check for potential breaking changes based on version patterns"""
-        issues = []
-        recommendations = []
-        
-        all_updates = [
-            {'type': addon.get('type', 'addon'), **addon} for addon in addon_updates
-        ] + [
-            {'type': hacs.get('type', 'hacs'), **hacs} for hacs in hacs_updates
-        ]
-        
-        breaking_count = 0
-        for update in all_updates:
-            current = update.get('current_version', '')
-            latest = update.get('latest_version', '')
-            component_type = update.get('type', 'addon')
-            
-            # Check for pre-release versions (alpha, beta, rc)
-            if self._is_prerelease(latest):
-                issues.append({
-                    'severity': 'high',
-                    'component': update['name'],
-                    'component_type': component_type,
-                    'description': f"Pre-release version: {latest}",
-                    'impact': 'Beta/RC versions may be unstable'
-                })
-                recommendations.append(f"Wait for stable release of {update['name']}")
-                breaking_count += 1
-            
-            # Check for version jumps (multiple major versions)
-            jump_size = self._get_version_jump_size(current, latest)
-            if jump_size >= 2:
-                issues.append({
-                    'severity': 'medium',
-                    'component': update['name'],
-                    'component_type': component_type,
-                    'description': f"Large version jump: {current} → {latest}",
-                    'impact': 'Skipping versions may miss important migration steps'
-                })
-                recommendations.append(f"Check if {update['name']} requires incremental updates")
-                breaking_count += 1
+        # Check for pre-release versions (alpha, beta, rc)
+        if _is_prerelease(latest):
+            issues.append({
+                'severity': 'high',
+                'component': update['name'],
+                'component_type': component_type,
+                'description': f"Pre-release version: {latest}",
+                'impact': 'Beta/RC versions may be unstable'
+            })
+            recommendations.append(f"Wait for stable release of {update['name']}")
         
-        return {'issues': issues, 'recommendations': recommendations}
+        # Check for version jumps (multiple major versions)
+        if jump_size >= 2:
+            issues.append({
+                'severity': 'medium',
+                'component': update['name'],
+                'component_type': component_type,
+                'description': f"Large version jump: {current} → {latest}",
+                'impact': 'Skipping versions may miss important migration steps'
+            })
+            recommendations.append(f"Check if {update['name']} requires incremental updates")
     
-    def _analyze_shared_dependency_risks(self) -> Dict:
+    def _analyze_shared_dependency_risks(self, issues: List[Dict], recommendations: List[str]):
         """
         Analyze shared dependency risks using the dependency graph (Feature 2)
         Detects multiple integrations relying on same dependency with different constraints
         """
-        issues = []
-        recommendations = []
-        
         if not self.dependency_graph:
-            return {'issues': issues, 'recommendations': recommendations}
-        
-        dependency_map = self.dependency_graph.get('dependency_map', {})
-        
-        # Find shared dependencies
-        shared_deps = {}
-        for package, users in dependency_map.items():
-            if len(users) > 1:
-                shared_deps[package] = users
+            return
         
-        if not shared_deps:
+        if not self._shared_deps:
             logger.debug("No shared dependencies detected")
-            return {'issues': issues, 'recommendations': recommendations}
+            return
         
-        logger.info(f"Analyzing {len(shared_deps)} shared dependencies")
+        logger.info(f"Analyzing {len(self._shared_deps)} shared dependencies")
+        high_risk_shared = self._high_risk_shared
         
-        # Analyze each shared dependency
-        for package, users in shared_deps.items():
-            user_count = len(users)
-            is_high_risk = package in self.HIGH_RISK_LIBRARIES
-            
-            # Get unique version specifiers
-            specifiers = set(u['specifier'] for u in users if u['specifier'] not in ['any', 'unknown'])
+        # Analyze each shared dependency that is high-risk or has conflicting
+        # version specifiers; the rest would not produce any findings
+        for package, (affected_integrations, specifiers) in self._notable_shared_deps.items():
+            user_count = len(affected_integrations)
+            is_high_risk = package in high_risk_shared
             has_conflict = len(specifiers) > 1
             
             # Determine severity based on risk and conflict
@@ -367,7 +525,7 @@ class DependencyAnalyzer:
             # Check for version conflicts
             if has_conflict:
                 severity = 'high' if is_high_risk else 'medium'
-                impact += f" Version constraint conflicts detected: {', '.join(specifiers)}"
+                impact += f" Version constraint conflicts detected: {', '.join(sorted(specifiers))}"
                 
                 issues.append({
                     'severity': severity,
@@ -375,7 +533,7 @@ class DependencyAnalyzer:
                     'component_type': 'integration',
                     'description': f"Version conflict for {package}: used by {user_count} integrations with different requirements",
                     'impact': impact,
-                    'affected_integrations': [u['integration'] for u in users]
+                    'affected_integrations': list(affected_integrations)
                 })
                 
                 recommendations.append(f"Review {package} version requirements across integrations")
@@ -389,53 +547,11 @@ class DependencyAnalyzer:
                     'component_type': 'integration',
                     'description': f"High-risk shared dependency: {package} (used by {user_count} integrations)",
                     'impact': impact,
-                    'affected_integrations': [u['integration'] for u in users]
+                    'affected_integrations': list(affected_integrations)
                 })
                 
                 if user_count >= 5:
                     recommendations.append(f"Monitor {package} carefully - changes affect {user_count} integrations")
-        
-        return {'issues': issues, 'recommendations': recommendations}
-    
-    def _is_major_version_change(self, current: str, latest: str) -> bool:
-        """Check if version change is a major version bump"""
-        try:
-            current_parsed = version.parse(current)
-            latest_parsed = version.parse(latest)
-            
-            # Extract major version numbers
-            if hasattr(current_parsed, 'major') and hasattr(latest_parsed, 'major'):
-                return latest_parsed.major > current_parsed.major
-            
-            # Fallback to simple comparison
-            current_major = int(current.split('.')[0]) if '.' in current else 0
-            latest_major = int(latest.split('.')[0]) if '.' in latest else 0
-            return latest_major > current_major
-        except Exception as e:
-            logger.debug(f"Version comparison failed: {e}")
-            return False
-    
-    def _is_prerelease(self, version_str: str) -> bool:
-        """Check if version is a pre-release"""
-        prerelease_patterns = ['alpha', 'beta', 'rc', 'dev', 'pre']
-        version_lower = version_str.lower()
-        return any(pattern in version_lower for pattern in prerelease_patterns)
-    
-    def _get_version_jump_size(self, current: str, latest: str) -> int:
-        """Calculate how many major versions are being jumped"""
-        try:
-            current_parsed = version.parse(current)
-            latest_parsed = version.parse(latest)
-            
-            if hasattr(current_parsed, 'major') and hasattr(latest_parsed, 'major'):
-                return latest_parsed.major - current_parsed.major
-            
-            # Fallback
-            current_major = int(current.split('.')[0]) if '.' in current else 0
-            latest_major = int(latest.split('.')[0]) if '.' in latest else 0
-            return latest_major - current_major
-        except Exception:
-            return 0
     
     def _calculate_confidence(self, issues: List[Dict], total_updates: int) -> float:
         """Calculate confidence score based on analysis depth"""
@@ -453,12 +569,12 @@ class DependencyAnalyzer:
         # Cap between 0.5 and 0.75 (never as confident as AI)
         return max(0.5, min(0.75, base_confidence))
     
-    def _generate_summary(self, total_updates: int, issues: List[Dict], safe: bool,
+    def _generate_summary(self, total_updates: int, severity_counts: Dict[str, int], safe: bool,
                          addon_updates: List[Dict], hacs_updates: List[Dict]) -> str:
         """Generate detailed analysis summary with component information"""
-        critical = len([i for i in issues if i['severity'] == 'critical'])
-        high = len([i for i in issues if i['severity'] == 'high'])
-        medium = len([i for i in issues if i['severity'] == 'medium'])
+        critical = severity_counts['critical']
+        high = severity_counts['high']
+        medium = severity_counts['medium']
         
         # Start with basic summary
         summary_parts = []
@@ -512,9 +628,6 @@ class DependencyAnalyzer:
         if not self.dependency_graph:
             return 0
         
-        dependency_map = self.dependency_graph.get('dependency_map', {})
-        integrations = self.dependency_graph.get('integrations', {})
-        
         # Get list of components being updated (using itertools.chain for efficiency)
         # We check both slug and name to handle different update source formats:
         # - slug: typically from add-on updates (e.g., 'mosquitto')
@@ -533,16 +646,15 @@ class DependencyAnalyzer:
         shared_count = 0
         checked_packages = set()
         
-        for domain, integration_data in integrations.items():
-            if domain.lower() in updating_components:
+        for component in updating_components:
+            for integration_data in self._integrations_lower.get(component, ()):
                 requirements = integration_data.get('requirements', [])
                 for req in requirements:
                     pkg = req.get('package')
                     if pkg and pkg not in checked_packages:
                         checked_packages.add(pkg)
                         # Check if this package is used by other integrations
-                        users = dependency_map.get(pkg, [])
-                        if len(users) > 1:
+                        if pkg in self._shared_deps:
                             shared_count += 1
         
         return shared_count
@@ -597,13 +709,9 @@ class DependencyAnalyzer:
         # Add dependency analysis info if available
         if self.dependency_graph:
             stats = self.dependency_graph.get('machine_readable', {}).get('statistics', {})
-            dependency_map = self.dependency_graph.get('dependency_map', {})
             
             # Count high-risk shared dependencies
-            high_risk_shared = sum(
-                1 for pkg, users in dependency_map.items()
-                if pkg in self.HIGH_RISK_LIBRARIES and len(users) > 1
-            )
+            high_risk_shared = len(self._high_risk_shared)
             
             if high_risk_shared > 0:
                 recommendations.append(
@@ -612,7 +720,7 @@ class DependencyAnalyzer:
                 )
             
             # Add info about shared dependency analysis
-            shared_deps = sum(1 for users in dependency_map.values() if len(users) > 1)
+            shared_deps = len(self._shared_deps)
             if shared_deps > 0:
                 recommendations.append(
                     f"Checked {shared_deps} shared dependencies for version conflicts"
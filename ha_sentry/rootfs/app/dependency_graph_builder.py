@@ -585,7 +585,31 @@ class DependencyGraphBuilder:
             'human_readable': human_readable,
             'integrations': self.integrations,
             'addons': self.addons,
-            'dependency_map': self.dependency_map
+            'dependency_map': self.dependency_map,
+            'dependency_summary': self._summarize_dependencies(),
+            'shared_dependency_map': {
+                package: users for package, users in self.dependency_map.items()
+                if len(users) > 1
+            }
+        }
+    
+    def _summarize_dependencies(self) -> Dict[str, Dict]:
+        """
+        Precompute the user names and version specifiers of every dependency
+        
+        Lets the analyzers read these per package instead of rebuilding them
+        from the user lists on every analysis.
+        
+        Returns:
+            Dict mapping package name to a dict with 'integrations' (tuple of
+            user names) and 'specifiers' (frozenset of version specifiers)
+        """
+        return {
+            package: {
+                'integrations': tuple(u['integration'] for u in users),
+                'specifiers': frozenset(u['specifier'] for u in users)
+            }
+            for package, users in self.dependency_map.items()
         }
     
     def _generate_human_readable_summary(self) -> str:
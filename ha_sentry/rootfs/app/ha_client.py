@@ -2,10 +2,11 @@
 Home Assistant API Client
 """
 import aiohttp
+import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -360,6 +361,32 @@ class HomeAssistantClient:
             logger.error(f"Error updating sensor: {e}", exc_info=True)
             return False
     
+    async def set_sensor_states_bulk(self, states: List[Tuple[str, str, Dict]]) -> bool:
+        """Set state for several custom sensor entities in one go
+        
+        Home Assistant's REST API has no bulk state endpoint, so the individual
+        POSTs are issued concurrently over the shared keep-alive session.
+        
+        Args:
+            states: List of (entity_id, state, attributes) tuples
+            
+        Returns:
+            True if every sensor was updated
+        """
+        results = await asyncio.gather(
+            *(self.set_sensor_state(entity_id, state, attributes)
+              for entity_id, state, attributes in states),
+            return_exceptions=True
+        )
+        success = True
+        for (entity_id, _, _), result in zip(states, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error updating sensor {entity_id}: {result}")
+                success = False
+            elif not result:
+                success = False
+        return success
+    
     async def create_lovelace_dashboard(self, dashboard_config: Dict) -> bool:
         """Create a Lovelace dashboard in Home Assistant
         
@@ -86,32 +86,6 @@ class InstallationReviewer:
         # Call AI with timeout protection
         logger.info(f"Sending installation review request to AI ({self.config.ai_provider} - {self.config.ai_model})")
         
-        def _sync_ai_call():
-            logger.debug("Starting synchronous AI API call for installation review")
-            logger.info("⏳ Waiting for AI to analyze installation... (this may take several minutes)")
-            try:
-                result = self.ai_client.client.chat.completions.create(
-                    model=self.config.ai_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": context
-                        }
-                    ],
-                    temperature=0.7,  # Higher temperature for more creative suggestions
-                    max_tokens=3000  # More tokens for comprehensive recommendations
-                )
-                logger.debug("Synchronous AI API call completed successfully")
-                return result
-            except Exception as e:
-                logger.error(f"Synchronous AI API call failed: {e}")
-                raise
-        
-        # Run in thread pool with async timeout
         # Installation reviews need more time than update analysis because they analyze
         # the entire HA setup, not just a few updates. Reasoning models especially need
         # extra time. The timeout is now configurable via installation_review_timeout
@@ -122,11 +96,27 @@ class InstallationReviewer:
         timeout_seconds = float(self.config.installation_review_timeout)
         try:
             logger.info(f"Waiting for AI response (timeout: {timeout_seconds}s / {timeout_seconds/60:.1f} minutes)")
-            logger.debug(f"Executing AI call with asyncio.to_thread and {timeout_seconds}s timeout")
-            response = await asyncio.wait_for(
-                asyncio.to_thread(_sync_ai_call),
-                timeout=timeout_seconds
-            )
+            logger.info("⏳ Waiting for AI to analyze installation... (this may take several minutes)")
+            logger.debug(f"Executing AI call with {timeout_seconds}s timeout")
+            async with self.ai_client.request_semaphore:
+                response = await asyncio.wait_for(
+                    self.ai_client.client.chat.completions.create(
+                        model=self.config.ai_model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": system_prompt
+                            },
+                            {
+                                "role": "user",
+                                "content": context
+                            }
+                        ],
+                        temperature=0.7,  # Higher temperature for more creative suggestions
+                        max_tokens=3000  # More tokens for comprehensive recommendations
+                    ),
+                    timeout=timeout_seconds
+                )
             logger.info("✅ AI call completed successfully")
             logger.debug(f"AI call completed within {timeout_seconds}s timeout")
         except asyncio.TimeoutError:
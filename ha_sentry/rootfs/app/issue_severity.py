@@ -0,0 +1,16 @@
+"""
+Issue severity helpers shared by the analyzers and the dashboard
+
+Kept free of third-party imports so any module can use them at import time.
+"""
+from collections import Counter
+from typing import Dict, List
+
+# Severity levels reported for update issues, most severe first
+SEVERITY_LEVELS = ('critical', 'high', 'medium', 'low')
+
+
+def count_severities(issues: List[Dict]) -> Dict[str, int]:
+    """Count issues per severity level in a single pass"""
+    counts = Counter(issue.get('severity') for issue in issues)
+    return {level: counts[level] for level in SEVERITY_LEVELS}
@@ -227,6 +227,9 @@ class SentryService:
         if self.web_server:
             await self.web_server.stop()
         
+        # Release pooled connections to the AI provider
+        await self.ai_client.close()
+        
         logger.info("Sentry service stopped")
     
     async def start(self):
@@ -0,0 +1,73 @@
+"""
+Stand-ins for the streaming OpenAI client shared by the AI client tests
+"""
+import sys
+import os
+import asyncio
+import tempfile
+from types import SimpleNamespace
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ha_sentry', 'rootfs', 'app'))
+
+from config_manager import ConfigManager
+from ai_client import AIClient
+
+
+class StubStream:
+    """Minimal stand-in for the openai AsyncStream yielding the given text chunks"""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.consumed = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+        return False
+
+    async def __aiter__(self):
+        for text in self.texts:
+            self.consumed += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StubCompletions:
+    """Stand-in for client.chat.completions that records every request"""
+
+    def __init__(self, texts, delay=0):
+        self.texts = texts
+        self.delay = delay
+        self.calls = []
+        self.streams = []
+
+    async def create(self, **kwargs):
+        """Return a new stream of the configured chunks, after the configured delay"""
+        assert kwargs.get('stream') is True
+        self.calls.append(kwargs)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        stream = StubStream(self.texts)
+        self.streams.append(stream)
+        return stream
+
+
+def make_client(texts, cache_dir=None, delay=0):
+    """
+    Create an AIClient whose stub async OpenAI client streams the given chunks
+
+    Returns:
+        Tuple of (AIClient, StubCompletions)
+    """
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    ai.AI_CACHE_FILE = os.path.join(cache_dir or tempfile.mkdtemp(), 'ai_cache.json')
+    config.ai_enabled = True
+
+    completions = StubCompletions(texts, delay)
+    ai.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return ai, completions
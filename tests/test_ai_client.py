@@ -457,6 +457,193 @@ def test_release_summary_no_truncation_when_short():
         return False
 
 
+def test_dependency_info_refreshed_when_graph_replaced():
+    """Test that memoized dependency info is recomputed after a new graph is assigned"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    
+    update = {'name': 'MQTT', 'slug': 'mqtt', 'current_version': '1.0', 'latest_version': '1.1'}
+    assert ai._get_dependency_info_for_update(update) == {}
+    
+    ai.dependency_graph = {
+        'integrations': {
+            'mqtt': {
+                'name': 'MQTT',
+                'requirements': [{'package': 'paho-mqtt', 'specifier': '>=1.6', 'high_risk': False}]
+            }
+        },
+        'dependency_map': {'paho-mqtt': [{'integration': 'mqtt', 'specifier': '>=1.6'}]}
+    }
+    
+    dep_info = ai._get_dependency_info_for_update(update)
+    assert dep_info['type'] == 'integration'
+    assert dep_info['requirements'][0]['package'] == 'paho-mqtt'
+    assert ai.dependency_analyzer.dependency_graph is ai.dependency_graph
+    
+    print("✓ Test passed: Dependency info is refreshed when the graph changes")
+    return True
+
+
+def test_batch_updates_splits_large_sets():
+    """Test that large update sets are split into batches and small sets are kept whole"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    
+    addon_updates = [{'name': f'Addon {i}', 'current_version': '1.0', 'latest_version': '1.1'} for i in range(3)]
+    hacs_updates = [{'name': f'HACS {i}', 'current_version': '1.0', 'latest_version': '1.1'} for i in range(2)]
+    
+    batches = ai._batch_updates(addon_updates, hacs_updates)
+    assert batches == [(addon_updates, hacs_updates)]
+    
+    many_hacs = [{'name': f'HACS {i}', 'current_version': '1.0', 'latest_version': '1.1'}
+                 for i in range(AIClient.MAX_UPDATES_PER_REQUEST * 2)]
+    batches = ai._batch_updates(addon_updates, many_hacs)
+    assert len(batches) == 3
+    assert batches[0][0] == addon_updates
+    assert sum(len(a) + len(h) for a, h in batches) == len(addon_updates) + len(many_hacs)
+    assert all(len(a) + len(h) <= AIClient.MAX_UPDATES_PER_REQUEST for a, h in batches)
+    
+    print("✓ Test passed: Updates are batched correctly")
+    return True
+
+
+def test_merge_results():
+    """Test that batch results are merged conservatively"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    
+    merged = ai._merge_results([
+        {'safe': True, 'confidence': 0.9, 'issues': [], 'recommendations': ['Backup first'],
+         'summary': 'Batch one fine.', 'ai_analysis': True},
+        {'safe': False, 'confidence': 0.7, 'issues': [{'severity': 'high'}],
+         'recommendations': ['Backup first', 'Update one at a time'],
+         'summary': 'Batch two risky.', 'ai_analysis': True}
+    ])
+    
+    assert merged['safe'] is False
+    assert merged['confidence'] == 0.7
+    assert merged['issues'] == [{'severity': 'high'}]
+    assert merged['recommendations'] == ['Backup first', 'Update one at a time']
+    assert merged['summary'] == 'Batch one fine. Batch two risky.'
+    assert merged['ai_analysis'] is True
+    
+    print("✓ Test passed: Batch results are merged correctly")
+    return True
+
+
+def test_parse_ai_response_ignores_trailing_braces():
+    """Test that braces in prose after the JSON object do not break parsing"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    
+    response = (
+        'Analysis:\n```json\n{"safe": false, "confidence": 0.8, '
+        '"summary": "Check {config} first"}\n```\n'
+        'Note: template syntax like {{ states(...) }} may need review.'
+    )
+    result = ai._parse_ai_response(response)
+    
+    assert result['ai_analysis'] is True
+    assert result['safe'] is False
+    assert result['confidence'] == 0.8
+    assert result['summary'] == 'Check {config} first'
+    
+    print("✓ Test passed: First balanced JSON object is parsed")
+    return True
+
+
+def test_parse_ai_response_skips_leading_braces():
+    """Test that brace-delimited prose before the JSON object is skipped"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    
+    response = 'Checked {addon} updates. Result: {"safe": true, "confidence": 0.9, "summary": "ok"}'
+    result = ai._parse_ai_response(response)
+    
+    assert result['ai_analysis'] is True
+    assert result['safe'] is True
+    assert result['confidence'] == 0.9
+    assert result['summary'] == 'ok'
+    
+    print("✓ Test passed: Leading brace prose is skipped")
+    return True
+
+
+def test_context_blocks_rebuilt_only_on_change():
+    """Test that per-update context blocks are reused until the update changes"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    addon = {'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}
+    
+    rendered = []
+    original = ai._format_addon_block
+    
+    def _counting_format(update):
+        rendered.append(update['latest_version'])
+        return original(update)
+    
+    ai._format_addon_block = _counting_format
+    
+    first = ai._prepare_analysis_context([addon], [])
+    second = ai._prepare_analysis_context([dict(addon)], [])
+    assert first == second
+    assert rendered == ['1.1'], "Unchanged update should reuse its block"
+    
+    third = ai._prepare_analysis_context([dict(addon, latest_version='1.2')], [])
+    assert rendered == ['1.1', '1.2']
+    assert 'Latest: 1.2' in third
+    
+    ai.dependency_graph = {'integrations': {}, 'dependency_map': {}}
+    ai._prepare_analysis_context([dict(addon, latest_version='1.2')], [])
+    assert rendered == ['1.1', '1.2', '1.2'], "Replacing the graph should rebuild blocks"
+    
+    print("✓ Test passed: Context blocks are rebuilt only when needed")
+    return True
+
+
+def test_context_reused_for_same_batch():
+    """Test that the built context is reused for an identical batch"""
+    os.environ['AI_ENABLED'] = 'false'
+    config = ConfigManager()
+    ai = AIClient(config)
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}]
+    
+    first = ai._get_context(addons, [], False)
+    assert ai._get_context([dict(addons[0])], [], False) is first
+    assert ai._get_context(addons, [], True) is not first, "Per-component context is built separately"
+    
+    ai.dependency_graph = {'integrations': {}, 'dependency_map': {}}
+    assert ai._get_context(addons, [], False) is not first, "Replacing the graph should rebuild the context"
+    
+    print("✓ Test passed: Context is reused for the same batch")
+    return True
+
+
+def test_client_retries_transient_errors():
+    """Test that the AI client is configured to retry with backoff"""
+    from unittest.mock import patch
+    
+    with patch.dict(os.environ, {
+        'AI_ENABLED': 'true',
+        'AI_PROVIDER': 'ollama',
+        'AI_ENDPOINT': 'http://127.0.0.1:11434'
+    }):
+        config = ConfigManager()
+        ai = AIClient(config)
+    
+    assert ai.client is not None
+    assert ai.client.max_retries == AIClient.AI_MAX_RETRIES
+    
+    print("✓ Test passed: AI client retries transient errors")
+    return True
+
+
 if __name__ == '__main__':
     print("Running AI Client edge case tests...\n")
     
@@ -470,7 +657,15 @@ if __name__ == '__main__':
         test_get_dependency_info_no_match,
         test_matching_logic_no_false_positives,
         test_release_summary_truncation_with_ellipsis,
-        test_release_summary_no_truncation_when_short
+        test_release_summary_no_truncation_when_short,
+        test_dependency_info_refreshed_when_graph_replaced,
+        test_batch_updates_splits_large_sets,
+        test_merge_results,
+        test_parse_ai_response_ignores_trailing_braces,
+        test_parse_ai_response_skips_leading_braces,
+        test_context_blocks_rebuilt_only_on_change,
+        test_context_reused_for_same_batch,
+        test_client_retries_transient_errors
     ]
     
     passed = 0
@@ -0,0 +1,193 @@
+"""
+Test AI response caching
+"""
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ha_sentry', 'rootfs', 'app'))
+
+from ai_client import AIClient
+from ai_stubs import make_client
+
+_SAFE_RESPONSE = ['{"safe": true, ', '"confidence": 0.9, "summary": "ok"}']
+
+
+def test_repeated_prompt_uses_cache():
+    """Test that an identical prompt is answered from the cache"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    
+    first = asyncio.run(ai._call_ai("analyze this", cache=True))
+    second = asyncio.run(ai._call_ai("analyze this", cache=True))
+    
+    assert first == second
+    assert len(completions.calls) == 1, "Second identical request should be served from cache"
+    
+    asyncio.run(ai._call_ai("analyze something else", cache=True))
+    assert len(completions.calls) == 2, "Different prompt should not hit the cache"
+    
+    print("✓ Test passed: Identical prompts are served from cache")
+    return True
+
+
+def test_cache_persists_across_instances():
+    """Test that the cache is reloaded from disk by a new client"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    asyncio.run(ai._call_ai("analyze this", cache=True))
+    
+    with open(ai.AI_CACHE_FILE) as f:
+        assert len(json.load(f)) == 1
+    
+    ai2, completions2 = make_client(_SAFE_RESPONSE, cache_dir)
+    asyncio.run(ai2._call_ai("analyze this", cache=True))
+    assert len(completions2.calls) == 0, "New client should reuse the persisted response"
+    
+    print("✓ Test passed: Cache persists across client instances")
+    return True
+
+
+def test_expired_entries_are_ignored():
+    """Test that cache entries older than the TTL are not used"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    asyncio.run(ai._call_ai("analyze this", cache=True))
+    
+    # Age every entry past the TTL
+    for key, (timestamp, response) in list(ai._response_cache.items()):
+        ai._response_cache[key] = (timestamp - AIClient.AI_CACHE_TTL_SECONDS - 1, response)
+    
+    asyncio.run(ai._call_ai("analyze this", cache=True))
+    assert len(completions.calls) == 2, "Expired entry should trigger a new request"
+    
+    print("✓ Test passed: Expired cache entries are ignored")
+    return True
+
+
+def test_update_order_does_not_affect_cache():
+    """Test that the same update set in a different order reuses the cached analysis"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    
+    addons = [
+        {'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'},
+        {'name': 'Node-RED', 'slug': 'a0d7b954_nodered', 'current_version': '2.0', 'latest_version': '2.1'}
+    ]
+    hacs = [
+        {'name': 'Mushroom', 'current_version': '3.0', 'latest_version': '3.1'},
+        {'name': 'Alarmo', 'current_version': '1.9', 'latest_version': '1.10'}
+    ]
+    
+    first = asyncio.run(ai.analyze_updates(addons, hacs))
+    ai._result_cache.clear()  # Exercise the prompt-level cache
+    second = asyncio.run(ai.analyze_updates(list(reversed(addons)), list(reversed(hacs))))
+    
+    assert first == second
+    assert len(completions.calls) == 1, "Reordered update set should produce the same prompt"
+    
+    print("✓ Test passed: Update order does not affect the prompt")
+    return True
+
+
+def test_safe_result_reused_for_same_update_set():
+    """Test that a safe result is reused until the update set or graph changes"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}]
+    
+    first = asyncio.run(ai.analyze_updates(addons, []))
+    second = asyncio.run(ai.analyze_updates(addons, []))
+    
+    assert len(completions.calls) == 1
+    assert second['cached'] is True
+    assert second['summary'] == first['summary']
+    
+    # A new version of the same add-on is a different update set
+    asyncio.run(ai.analyze_updates([dict(addons[0], latest_version='1.2')], []))
+    assert len(completions.calls) == 2
+    
+    # Replacing the dependency graph invalidates previous results; the unchanged
+    # prompt is still answered from the persisted response cache
+    ai.dependency_graph = {'integrations': {}, 'dependency_map': {}}
+    third = asyncio.run(ai.analyze_updates(addons, []))
+    assert 'cached' not in third
+    assert len(completions.calls) == 2
+    
+    print("✓ Test passed: Safe results are reused for an unchanged update set")
+    return True
+
+
+def test_unsafe_result_not_reused():
+    """Test that results flagging issues are re-analyzed on the next scan"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    
+    completions.texts = ['{"safe": false, "confidence": 0.8, "summary": "risky"}']
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '2.0'}]
+    
+    asyncio.run(ai.analyze_updates(addons, []))
+    result = asyncio.run(ai.analyze_updates(addons, []))
+    
+    assert len(completions.calls) == 2
+    assert 'cached' not in result
+    assert not ai._response_cache, "Unsafe responses should not be persisted"
+    
+    # Unsafe responses already on disk are not served either
+    asyncio.run(ai._call_ai("analyze this", cache=True))
+    asyncio.run(ai._call_ai("analyze this", cache=True, cache_if=ai._is_safe_response))
+    assert len(completions.calls) == 4
+    
+    print("✓ Test passed: Unsafe results are not reused")
+    return True
+
+
+def test_caching_is_opt_in():
+    """Test that callers which do not ask for caching always reach the AI"""
+    cache_dir = tempfile.mkdtemp()
+    ai, completions = make_client(_SAFE_RESPONSE, cache_dir)
+    
+    asyncio.run(ai._call_ai("analyze this"))
+    asyncio.run(ai._call_ai("analyze this"))
+    
+    assert len(completions.calls) == 2, "Uncached calls should not be served from the cache"
+    assert not os.path.exists(ai.AI_CACHE_FILE), "Uncached calls should not be persisted"
+    
+    print("✓ Test passed: Response caching is opt-in")
+    return True
+
+
+if __name__ == '__main__':
+    print("Running AI response cache tests...\n")
+    
+    tests = [
+        test_repeated_prompt_uses_cache,
+        test_cache_persists_across_instances,
+        test_expired_entries_are_ignored,
+        test_update_order_does_not_affect_cache,
+        test_safe_result_reused_for_same_update_set,
+        test_unsafe_result_not_reused,
+        test_caching_is_opt_in
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+    
+    print(f"\n{'='*50}")
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print(f"{'='*50}")
+    
+    sys.exit(0 if failed == 0 else 1)
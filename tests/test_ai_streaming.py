@@ -0,0 +1,298 @@
+"""
+Test streaming of AI responses
+"""
+import sys
+import os
+import asyncio
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ha_sentry', 'rootfs', 'app'))
+
+from ai_client import AIClient, _JsonObjectScanner
+from ai_stubs import StubStream, make_client
+
+
+def test_stream_concatenates_chunks():
+    """Test that streamed chunks are joined into the full response"""
+    ai, completions = make_client(['Hello', ', ', 'world'])
+    
+    response = asyncio.run(ai._call_ai("prompt"))
+    
+    assert response == 'Hello, world'
+    assert completions.streams[-1].closed
+    
+    print("✓ Test passed: Streamed chunks are concatenated")
+    return True
+
+
+def test_stream_stops_after_json_object():
+    """Test that the stream is closed once a complete JSON object is received"""
+    ai, completions = make_client([
+        'Here is my analysis:\n{"safe": true, ',
+        '"summary": "Use {braces} carefully"}',
+        '\nLet me also explain in detail...',
+        ' more prose'
+    ])
+    
+    response = asyncio.run(ai._call_ai("prompt", stop_after_json=True))
+    
+    assert response.endswith('"summary": "Use {braces} carefully"}')
+    assert completions.streams[-1].consumed == 2, "Trailing prose chunks should not be read"
+    assert completions.streams[-1].closed
+    
+    print("✓ Test passed: Stream stops after the JSON object")
+    return True
+
+
+def test_json_mode_requested_for_supported_providers():
+    """Test that JSON mode is requested unless the provider is known to reject it"""
+    for provider, expect_json_mode in (('openai', True), ('ollama', True), ('openwebui', True), ('lmstudio', False)):
+        ai, completions = make_client(['{"safe": true}'])
+        ai.config.ai_provider = provider
+        
+        asyncio.run(ai._call_ai("prompt", stop_after_json=True))
+        
+        has_json_mode = completions.calls[-1].get('response_format') == {"type": "json_object"}
+        assert has_json_mode == expect_json_mode, f"Unexpected response_format for {provider}"
+    
+    # Free-form calls never request JSON mode
+    ai, completions = make_client(['text'])
+    ai.config.ai_provider = 'openai'
+    asyncio.run(ai._call_ai("prompt"))
+    assert 'response_format' not in completions.calls[-1]
+    
+    print("✓ Test passed: JSON mode requested only where supported")
+    return True
+
+
+def test_json_mode_disabled_after_rejection():
+    """Test that a provider rejecting JSON mode is retried and remembered"""
+    import httpx
+    import openai
+    
+    ai, completions = make_client(['{"safe": true}'])
+    ai.config.ai_provider = 'openwebui'
+    calls = []
+    
+    async def _create(**kwargs):
+        calls.append(kwargs)
+        if 'response_format' in kwargs:
+            response = httpx.Response(400, request=httpx.Request('POST', 'http://localhost/api/chat/completions'))
+            raise openai.BadRequestError("response_format not supported", response=response, body=None)
+        return StubStream(['{"safe": true}'])
+    
+    ai.client.chat.completions.create = _create
+    
+    assert asyncio.run(ai._call_ai("first", stop_after_json=True)) == '{"safe": true}'
+    assert [('response_format' in call) for call in calls] == [True, False]
+    
+    asyncio.run(ai._call_ai("second", stop_after_json=True))
+    assert 'response_format' not in calls[-1], "JSON mode should not be retried"
+    
+    print("✓ Test passed: Rejected JSON mode falls back and is remembered")
+    return True
+
+
+def test_unrelated_bad_request_is_not_json_mode_rejection():
+    """Test that bad requests unrelated to response_format are raised and not remembered"""
+    import httpx
+    import openai
+    
+    ai, completions = make_client(['{"safe": true}'])
+    ai.config.ai_provider = 'openwebui'
+    calls = []
+    
+    async def _create(**kwargs):
+        calls.append(kwargs)
+        response = httpx.Response(400, request=httpx.Request('POST', 'http://localhost/api/chat/completions'))
+        raise openai.BadRequestError("maximum context length exceeded", response=response,
+                                     body={'message': 'maximum context length exceeded', 'param': 'messages'})
+    
+    ai.client.chat.completions.create = _create
+    
+    try:
+        asyncio.run(ai._call_ai("first", stop_after_json=True))
+        assert False, "Unrelated bad request should be raised"
+    except openai.BadRequestError:
+        pass
+    
+    assert len(calls) == 1, "Request should not be retried without JSON mode"
+    assert 'openwebui' not in ai._json_mode_rejected
+    
+    print("✓ Test passed: Unrelated bad requests do not disable JSON mode")
+    return True
+
+
+def test_max_tokens_scales_with_update_count():
+    """Test that the completion budget grows with the batch size up to the cap"""
+    ai, completions = make_client(['{"safe": true}'])
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}]
+    
+    asyncio.run(ai.analyze_updates(addons, []))
+    
+    expected = AIClient.RESPONSE_TOKENS_BASE + AIClient.RESPONSE_TOKENS_PER_UPDATE
+    assert completions.calls[-1]['max_tokens'] == expected
+    assert expected < AIClient.MAX_RESPONSE_TOKENS
+    
+    print("✓ Test passed: max_tokens scales with update count")
+    return True
+
+
+def test_per_component_analysis_single_request():
+    """Test that per-component mode sends one message per update in a single request"""
+    ai, completions = make_client([
+        '{"components": [',
+        '{"component": "Mosquitto", "safe": true, "confidence": 0.9, "summary": "Minor fixes", '
+        '"recommendations": ["Backup first"]}, ',
+        '{"component": "Mushroom", "safe": false, "confidence": 0.6, "summary": "Breaking card config", '
+        '"issues": [{"severity": "high", "component": "Mushroom"}], "recommendations": ["Backup first"]}',
+        ']}'
+    ])
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}]
+    hacs = [{'name': 'Mushroom', 'current_version': '3.0', 'latest_version': '4.0'}]
+    
+    result = asyncio.run(ai.analyze_updates(addons, hacs, per_component=True))
+    
+    messages = completions.calls[-1]['messages']
+    roles = [message['role'] for message in messages]
+    assert roles == ['system', 'user', 'user', 'user', 'user'], roles
+    assert 'Mosquitto' in messages[2]['content']
+    assert 'Mushroom' in messages[3]['content']
+    
+    assert result['safe'] is False
+    assert result['confidence'] == 0.6
+    assert result['issues'] == [{'severity': 'high', 'component': 'Mushroom'}]
+    assert result['recommendations'] == ['Backup first']
+    assert result['summary'] == 'Mosquitto: Minor fixes Mushroom: Breaking card config'
+    assert result['severity_counts'] == {'critical': 0, 'high': 1, 'medium': 0, 'low': 0}
+    
+    print("✓ Test passed: Per-component analysis uses a single request")
+    return True
+
+
+def test_unparseable_component_response_falls_back_off_loop():
+    """Test that a malformed per-component response falls back in a worker thread"""
+    import threading
+    
+    ai, completions = make_client(['{"components": [{"component": "Mosquitto", "confidence": "high"}]}'])
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'}]
+    fallback_threads = []
+    analyze = ai.dependency_analyzer.analyze_updates
+    
+    def _analyze(addon_updates, hacs_updates):
+        fallback_threads.append(threading.current_thread())
+        return analyze(addon_updates, hacs_updates)
+    
+    ai.dependency_analyzer.analyze_updates = _analyze
+    result = asyncio.run(ai.analyze_updates(addons, [], per_component=True))
+    
+    assert result['ai_analysis'] is False
+    assert fallback_threads and fallback_threads[0] is not threading.main_thread()
+    
+    print("✓ Test passed: Unparseable response falls back off the event loop")
+    return True
+
+
+def test_unparseable_batch_falls_back_for_whole_set():
+    """Test that one unparseable batch makes the whole update set fall back once"""
+    ai, completions = make_client([])
+    ai.MAX_UPDATES_PER_REQUEST = 1
+    bodies = ['{"safe": true, "confidence": 0.9, "summary": "ok"}', '{"safe": true, "confidence": "high"}']
+    create = completions.create
+    
+    async def _create(**kwargs):
+        completions.texts = [bodies[len(completions.calls)]]
+        return await create(**kwargs)
+    
+    completions.create = _create
+    addons = [
+        {'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '1.1'},
+        {'name': 'MariaDB', 'slug': 'core_mariadb', 'current_version': '2.0', 'latest_version': '2.1'}
+    ]
+    
+    result = asyncio.run(ai.analyze_updates(addons, []))
+    
+    assert len(completions.calls) == 2
+    assert result['ai_analysis'] is False
+    assert result['summary'].startswith('Analyzed 2 updates')
+    assert not ai._result_cache, "Fallback results should not be cached as AI results"
+    
+    print("✓ Test passed: Unparseable batch falls back for the whole set")
+    return True
+
+
+def test_json_scanner_ignores_braces_in_strings():
+    """Test that braces and escaped quotes inside strings do not affect depth"""
+    scanner = _JsonObjectScanner()
+    
+    assert not scanner.feed('{"a": "}\\"}", ')
+    assert not scanner.feed('"b": {"c": 1}')
+    assert scanner.feed('}')
+    
+    print("✓ Test passed: JSON scanner handles strings and nesting")
+    return True
+
+
+def test_prose_braces_before_json_are_skipped():
+    """Test that braces in prose before the JSON do not end the stream early"""
+    scanner = _JsonObjectScanner()
+    assert not scanner.feed('Checked the {addon} updates.\n')
+    assert not scanner.feed('```json\n{"safe": false, ')
+    assert scanner.feed('"summary": "x"}```')
+    
+    # Without JSON mode the model may write prose first; its verdict must survive
+    ai, completions = make_client([
+        'Checked the {addon} updates.\n',
+        '```json\n{"safe": false, "confidence": 0.8, "summary": "Breaking change"}```',
+        '\nLet me also explain...'
+    ])
+    ai.config.ai_provider = 'lmstudio'
+    addons = [{'name': 'Mosquitto', 'slug': 'core_mosquitto', 'current_version': '1.0', 'latest_version': '2.0'}]
+    
+    result = asyncio.run(ai.analyze_updates(addons, []))
+    
+    assert 'response_format' not in completions.calls[-1]
+    assert completions.streams[-1].consumed == 2
+    assert result['safe'] is False
+    assert result['confidence'] == 0.8
+    assert result['summary'] == 'Breaking change'
+    
+    print("✓ Test passed: Prose braces before the JSON are skipped")
+    return True
+
+
+if __name__ == '__main__':
+    print("Running AI streaming tests...\n")
+    
+    tests = [
+        test_stream_concatenates_chunks,
+        test_stream_stops_after_json_object,
+        test_json_mode_requested_for_supported_providers,
+        test_json_mode_disabled_after_rejection,
+        test_unrelated_bad_request_is_not_json_mode_rejection,
+        test_max_tokens_scales_with_update_count,
+        test_per_component_analysis_single_request,
+        test_unparseable_component_response_falls_back_off_loop,
+        test_unparseable_batch_falls_back_for_whole_set,
+        test_json_scanner_ignores_braces_in_strings,
+        test_prose_braces_before_json_are_skipped
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+    
+    print(f"\n{'='*50}")
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print(f"{'='*50}")
+    
+    sys.exit(0 if failed == 0 else 1)
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ha_sentry', 'r
 
 from config_manager import ConfigManager
 from ai_client import AIClient
+from ai_stubs import make_client
 
 
 async def test_timeout_fallback_triggered():
@@ -97,6 +98,29 @@ async def test_asyncio_to_thread_not_blocking():
     return True
 
 
+async def test_async_client_does_not_block_event_loop():
+    """Test that analyze_updates awaits the async client instead of blocking"""
+    print("\n=== Test: Async Client Does Not Block Event Loop ===")
+    
+    ai, _completions = make_client(['{"safe": true, "confidence": 0.9}'], delay=1)
+    
+    async def fast_task():
+        await asyncio.sleep(0.1)
+        return time.time()
+    
+    start_time = time.time()
+    result, fast_done = await asyncio.gather(
+        ai.analyze_updates([{'name': 'Test', 'current_version': '1.0', 'latest_version': '1.1'}], []),
+        fast_task()
+    )
+    
+    assert result['ai_analysis'] is True
+    assert fast_done - start_time < 0.5, "Fast task should not wait for the AI call"
+    
+    print("✓ Test passed: AI call runs without blocking other tasks")
+    return True
+
+
 async def main():
     """Run all async tests"""
     print("Running AI timeout fix tests...")
@@ -109,6 +133,9 @@ async def main():
     # Test 2: Async wrapper
     results.append(await test_asyncio_to_thread_not_blocking())
     
+    # Test 3: Async client
+    results.append(await test_async_client_does_not_block_event_loop())
+    
     # Summary
     print("\n" + "=" * 50)
     passed = sum(results)
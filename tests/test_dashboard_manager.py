@@ -0,0 +1,152 @@
+"""
+Test dashboard sensor updates
+"""
+import sys
+import os
+import asyncio
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ha_sentry', 'rootfs', 'app'))
+
+from dashboard_manager import DashboardManager
+from ha_client import HomeAssistantClient
+
+
+class _FakeHAClient:
+    """Records sensor updates and tracks how many are in flight at once"""
+
+    def __init__(self, fail_entity=None):
+        self.states = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_entity = fail_entity
+
+    async def set_sensor_state(self, entity_id, state, attributes):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if entity_id == self.fail_entity:
+            raise RuntimeError("connection reset")
+        self.states[entity_id] = (state, attributes)
+        return True
+
+    set_sensor_states_bulk = HomeAssistantClient.set_sensor_states_bulk
+
+
+ADDON_UPDATES = [{'name': 'Addon', 'current_version': '1.0', 'latest_version': '1.1'}]
+HACS_UPDATES = [{'name': 'Integration', 'current_version': '2.0', 'latest_version': '2.1'}]
+ANALYSIS = {
+    'safe': False,
+    'confidence': 0.75,
+    'issues': [
+        {'severity': 'critical'},
+        {'severity': 'high'},
+        {'severity': 'high'},
+        {'severity': 'low'},
+    ]
+}
+
+
+def test_sensors_updated_concurrently():
+    """Test that all sensors are sent at once with a shared timestamp"""
+    ha_client = _FakeHAClient()
+    asyncio.run(DashboardManager(ha_client).update_sensors(ADDON_UPDATES, HACS_UPDATES, ANALYSIS))
+
+    assert len(ha_client.states) == 6
+    assert ha_client.max_in_flight == 6
+    assert len({attrs['last_check'] for _, attrs in ha_client.states.values()}) == 1
+    assert ha_client.states['sensor.ha_sentry_update_status'][0] == 'review_required'
+    assert ha_client.states['sensor.ha_sentry_confidence'][0] == '75'
+
+    print("✓ Test passed: Sensors are updated concurrently")
+    return True
+
+
+def test_issue_severity_counts():
+    """Test that the issues sensor reports per-severity counts"""
+    ha_client = _FakeHAClient()
+    asyncio.run(DashboardManager(ha_client).update_sensors(ADDON_UPDATES, HACS_UPDATES, ANALYSIS))
+
+    state, attrs = ha_client.states['sensor.ha_sentry_issues']
+    assert state == '4'
+    assert (attrs['critical'], attrs['high'], attrs['medium'], attrs['low']) == (1, 2, 0, 1)
+
+    analysis = dict(ANALYSIS, severity_counts={'critical': 0, 'high': 3, 'medium': 1, 'low': 0})
+    asyncio.run(DashboardManager(ha_client).update_sensors(ADDON_UPDATES, HACS_UPDATES, analysis))
+
+    _, attrs = ha_client.states['sensor.ha_sentry_issues']
+    assert (attrs['critical'], attrs['high'], attrs['medium'], attrs['low']) == (0, 3, 1, 0)
+
+    print("✓ Test passed: Issue severities are counted")
+    return True
+
+
+def test_issues_list_is_truncated():
+    """Test that the issues sensor only lists the first issues"""
+    ha_client = _FakeHAClient()
+    manager = DashboardManager(ha_client)
+    issues = [{'severity': 'low', 'component': f'c{n}'} for n in range(manager.MAX_ISSUES_IN_ATTRIBUTES + 5)]
+    asyncio.run(manager.update_sensors(ADDON_UPDATES, HACS_UPDATES, dict(ANALYSIS, issues=issues)))
+
+    state, attrs = ha_client.states['sensor.ha_sentry_issues']
+    assert state == str(len(issues))
+    assert attrs['issues_list'] == issues[:manager.MAX_ISSUES_IN_ATTRIBUTES]
+    assert attrs['issues_truncated'] == 5
+    assert attrs['low'] == len(issues)
+
+    # Severe issues are kept when the list has to be cut
+    severe = [{'severity': 'critical', 'component': 'db'}, {'severity': None, 'component': 'x'}]
+    asyncio.run(manager.update_sensors(ADDON_UPDATES, HACS_UPDATES, dict(ANALYSIS, issues=issues + severe)))
+    _, attrs = ha_client.states['sensor.ha_sentry_issues']
+    assert attrs['issues_list'][0] == severe[0]
+    assert len(attrs['issues_list']) == manager.MAX_ISSUES_IN_ATTRIBUTES
+    assert severe[1] not in attrs['issues_list']
+
+    print("✓ Test passed: Issues list is truncated")
+    return True
+
+
+def test_failed_sensor_does_not_block_others():
+    """Test that one failing sensor update does not prevent the rest"""
+    ha_client = _FakeHAClient(fail_entity='sensor.ha_sentry_issues')
+    asyncio.run(DashboardManager(ha_client).update_sensors(ADDON_UPDATES, HACS_UPDATES, ANALYSIS))
+    
+    states = [('sensor.ha_sentry_issues', '0', {}), ('sensor.ha_sentry_confidence', '50', {})]
+    assert asyncio.run(ha_client.set_sensor_states_bulk(states)) is False
+
+    assert 'sensor.ha_sentry_issues' not in ha_client.states
+    assert len(ha_client.states) == 5
+
+    print("✓ Test passed: Failed sensor update is isolated")
+    return True
+
+
+if __name__ == '__main__':
+    print("Running dashboard manager tests...\n")
+
+    tests = [
+        test_sensors_updated_concurrently,
+        test_issue_severity_counts,
+        test_issues_list_is_truncated,
+        test_failed_sensor_does_not_block_others
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print(f"{'='*50}")
+
+    sys.exit(0 if failed == 0 else 1)
@@ -35,6 +35,9 @@ def test_dependency_analyzer():
     # Should detect major version change
     assert len(result['issues']) > 0
     assert any('major' in issue['description'].lower() for issue in result['issues'])
+    assert result['severity_counts']['high'] == sum(
+        1 for issue in result['issues'] if issue['severity'] == 'high'
+    )
     
     print("✓ Test case 1 passed: Major version update detected")
     
@@ -61,6 +64,12 @@ def test_dependency_analyzer():
     multiple_critical = any('multiple critical' in issue['description'].lower() 
                           for issue in result2['issues'])
     
+    # Recommendations are de-duplicated without losing their order
+    assert len(result2['recommendations']) == len(set(result2['recommendations']))
+    assert result2['recommendations'] == analyzer.analyze_updates(addon_updates_2, [])['recommendations']
+    assert result2['recommendations'].index('Monitor MariaDB after update') < \
+        result2['recommendations'].index('Update critical services one at a time')
+    
     print("✓ Test case 2 passed: Multiple critical updates detected")
     
     # Test case 3: High update volume
@@ -95,6 +104,21 @@ def test_dependency_analyzer():
     assert any('pre-release' in issue['description'].lower() or 'beta' in issue['description'].lower()
                for issue in result4['issues'])
     
+    # PEP 440 short forms are recognised as well as spelled-out markers
+    from dependency_analyzer import _is_prerelease
+    assert _is_prerelease('2024.12.0b1')
+    assert _is_prerelease('v2.0-dev')
+    assert not _is_prerelease('2024.12.1')
+    assert not _is_prerelease('')
+    assert not _is_prerelease(None)
+    
+    # Plain and PEP 440 versions give the same major version jump
+    from dependency_analyzer import _get_version_jump_size
+    assert _get_version_jump_size('1.9.3', '3.0') == 2
+    assert _get_version_jump_size('v1.9.3', '3.0b1') == 2
+    assert _get_version_jump_size('2024.12.1', '2024.1.0') == 0
+    assert _get_version_jump_size('abc123', '2.0.0') == 0
+    
     print("✓ Test case 4 passed: Pre-release version detected")
     
     # Test case 5: No updates (edge case)
@@ -106,11 +130,135 @@ def test_dependency_analyzer():
     
     return True
 
+def test_conflict_pattern_matching():
+    """Test that conflict patterns match anywhere in the slug, once each"""
+    from dependency_analyzer import DependencyAnalyzer
+    
+    analyzer = DependencyAnalyzer()
+    
+    assert analyzer._match_conflict_patterns('core_mariadb') == ['mariadb']
+    assert analyzer._match_conflict_patterns('mosquitto-node-red-mosquitto') == ['mosquitto', 'node-red']
+    assert analyzer._match_conflict_patterns('grafana') == []
+    assert analyzer._match_conflict_patterns('a0d7b954_mosquitto_backup') == ['mosquitto']
+    # Every pattern in the slug is found, not just the name after the last '_'
+    assert analyzer._match_conflict_patterns('mosquitto_mariadb') == ['mariadb', 'mosquitto']
+    assert analyzer._match_conflict_patterns('node-red_mosquitto') == ['mosquitto', 'node-red']
+    
+    result = analyzer.analyze_updates([{
+        'name': 'Mosquitto',
+        'slug': 'core_mosquitto',
+        'current_version': '5.1.0',
+        'latest_version': '6.0.0'
+    }], [])
+    assert 'Check compatibility with: zigbee2mqtt, zwave, node-red' in result['recommendations']
+    
+    print("✓ Conflict pattern matching test passed")
+    return True
+
+def test_result_cache():
+    """Test that repeated update sets reuse the previous analysis"""
+    from dependency_analyzer import DependencyAnalyzer
+    
+    analyzer = DependencyAnalyzer()
+    updates = [{
+        'name': 'MariaDB',
+        'slug': 'core_mariadb',
+        'current_version': '2.5.0',
+        'latest_version': '3.0.0'
+    }]
+    
+    first = analyzer.analyze_updates(updates, [])
+    first['issues'].clear()
+    second = analyzer.analyze_updates([dict(updates[0])], [])
+    assert second['issues'], "Mutating a returned result must not change the cache"
+    assert len(analyzer._result_cache) == 1
+    
+    # A different version transition is analyzed again
+    third = analyzer.analyze_updates([dict(updates[0], current_version='3.0.0', latest_version='3.0.1')], [])
+    assert third['issues'][0]['severity'] == 'medium'
+    assert len(analyzer._result_cache) == 2
+    
+    # Results computed with another graph are not reused
+    analyzer.dependency_graph = {'dependency_map': {}}
+    assert len(analyzer._result_cache) == 0
+    
+    # Shared dependencies are derived once per graph
+    analyzer.dependency_graph = {'dependency_map': {
+        'aiohttp': [{'integration': 'a', 'specifier': 'any'}, {'integration': 'b', 'specifier': 'any'}],
+        'pyyaml': [{'integration': 'a', 'specifier': 'any'}]
+    }}
+    assert list(analyzer._shared_deps) == ['aiohttp']
+    assert analyzer._high_risk_shared == {'aiohttp'}
+    
+    # Only high-risk or conflicting shared dependencies are examined
+    analyzer.dependency_graph = {'dependency_map': {
+        'aiohttp': [{'integration': 'a', 'specifier': 'any'}, {'integration': 'b', 'specifier': 'any'}],
+        'pyyaml': [{'integration': 'a', 'specifier': '>=6'}, {'integration': 'b', 'specifier': 'unknown'}],
+        'pytz': [{'integration': 'a', 'specifier': '>=2022'}, {'integration': 'b', 'specifier': '<2024'}]
+    }}
+    assert analyzer._notable_shared_deps == {
+        'aiohttp': (('a', 'b'), frozenset()),
+        'pytz': (('a', 'b'), frozenset({'>=2022', '<2024'}))
+    }
+    
+    # Updating components are matched to integrations case-insensitively
+    analyzer.dependency_graph = {
+        'integrations': {
+            'MQTT': {'requirements': [{'package': 'paho-mqtt'}, {'package': 'pyyaml'}]},
+            'tasmota': {'requirements': [{'package': 'paho-mqtt'}]}
+        },
+        'dependency_map': {
+            'paho-mqtt': [{'integration': 'MQTT', 'specifier': 'any'}, {'integration': 'tasmota', 'specifier': 'any'}],
+            'pyyaml': [{'integration': 'MQTT', 'specifier': 'any'}]
+        }
+    }
+    assert analyzer._count_shared_dependencies_in_updates([{'slug': 'mqtt', 'name': 'MQTT'}], []) == 1
+    assert analyzer._count_shared_dependencies_in_updates([], [{'name': 'Zigbee'}]) == 0
+    
+    print("✓ Result cache test passed")
+    return True
+
+def test_graph_swap_during_analysis():
+    """Test that replacing the graph waits for an analysis running in another thread"""
+    import threading
+    from dependency_analyzer import DependencyAnalyzer
+    
+    analyzer = DependencyAnalyzer({'dependency_map': {}})
+    updates = [{'name': 'MariaDB', 'slug': 'core_mariadb', 'current_version': '2.5.0', 'latest_version': '3.0.0'}]
+    started = threading.Event()
+    release = threading.Event()
+    analyze = analyzer._analyze_updates
+    
+    def _slow_analyze(addon_updates, hacs_updates):
+        started.set()
+        release.wait(5)
+        return analyze(addon_updates, hacs_updates)
+    
+    analyzer._analyze_updates = _slow_analyze
+    worker = threading.Thread(target=analyzer.analyze_updates, args=(updates, []))
+    worker.start()
+    assert started.wait(5)
+    
+    swap = threading.Thread(target=setattr, args=(analyzer, 'dependency_graph', None))
+    swap.start()
+    swap.join(0.2)
+    assert swap.is_alive(), "Graph swap should wait for the running analysis"
+    
+    release.set()
+    worker.join(5)
+    swap.join(5)
+    assert analyzer.dependency_graph is None
+    assert len(analyzer._result_cache) == 0, "Result for the old graph must not be cached"
+    
+    print("✓ Graph swap during analysis test passed")
+    return True
+
 if __name__ == '__main__':
     print("Testing DependencyAnalyzer...\n")
     
     try:
-        if test_dependency_analyzer():
+        if (test_dependency_analyzer() and test_conflict_pattern_matching() and test_result_cache()
+                and test_graph_swap_during_analysis()):
             print("\n✅ All tests passed!")
             sys.exit(0)
     except Exception as e:
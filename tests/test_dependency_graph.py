@@ -295,6 +295,14 @@ def test_graph_output_formats():
         assert 'dependency_map' in mr
         assert 'statistics' in mr
         
+        # Check precomputed per-package summary
+        assert graph_data['dependency_summary']['aiohttp'] == {
+            'integrations': ('Test Integration',),
+            'specifiers': frozenset({'>=3.9'})
+        }
+        # A dependency with a single user is not shared
+        assert graph_data['shared_dependency_map'] == {}
+        
         # Check human-readable format
         hr = graph_data['human_readable']
         assert isinstance(hr, str)